@@ -0,0 +1,53 @@
+# FINAL PROJECT FLASHCARD APP / core / answer_index.py
+
+from typing import List, Dict
+from .per_set_index import PerSetIndex
+
+
+class AnswerIndex(PerSetIndex):
+    """Distinct answers of every set in the library, grouped by difficulty
+
+    Lets a small set borrow multiple-choice options from sets of the same
+    difficulty without opening them.
+    """
+
+    def __init__(self, directory=None):
+        super().__init__(directory)
+        self.sets: Dict[str, Dict] = {}  # Set id -> {'set_name', 'difficulty', 'answers'}
+
+    def update_set(self, set_data: Dict):
+        answers = list(dict.fromkeys(card['answer'] for card in set_data['cards']))
+        with self.lock:
+            self.sets[set_data['set_id']] = {
+                'set_name': set_data['set_name'],
+                'difficulty': set_data.get('difficulty', 'Easy'),
+                'answers': answers
+            }
+
+    def remove_set(self, set_id):
+        with self.lock:
+            self.sets.pop(set_id, None)
+
+    def rebuild(self, all_sets: List[Dict]):
+        with self.lock:
+            self.sets = {}
+            for set_data in all_sets:
+                self.update_set(set_data)
+
+    def set_ids(self) -> set:
+        return set(self.sets)
+
+    def answers_for(self, difficulty: str, exclude_set_id=None) -> List[str]:
+        """Distinct answers of the other sets with this difficulty"""
+        answers = {}
+        with self.lock:
+            for set_id, entry in self.sets.items():
+                if set_id != exclude_set_id and entry['difficulty'] == difficulty:
+                    answers.update(dict.fromkeys(entry['answers']))
+        return list(answers)
+
+    def encode_set(self, set_id) -> Dict:
+        return self.sets[set_id]
+
+    def decode_sets(self, payloads: Dict[str, Dict]):
+        self.sets = payloads
@@ -2,18 +2,27 @@
 
 from typing import List, Dict
 from .data_manager import DataManager
+from .progress_writer import get_progress_writer
+from .session_store import get_session_store, session_key
+from .set_search import SetSearch
 from .flashcard_model import Flashcard, FlashcardSet
 
 class FlashcardController:
     def __init__(self, username=None):
         # Initialize data manager for file operations with username
         self.data_manager = DataManager(username)
+        # Shared per-user queue that batches progress writes off the GUI thread
+        self.progress_writer = get_progress_writer(username)
+        # Where unfinished study sessions left off
+        self.session_store = get_session_store(username, self.data_manager.data_dir)
     
     def set_username(self, username):
         """Update the username for user-specific flashcard storage"""
         self.data_manager.set_username(username)
+        self.progress_writer = get_progress_writer(username)
+        self.session_store = get_session_store(username, self.data_manager.data_dir)
     
-    def create_flashcard_set(self, set_name: str, cards_data: List[Dict], difficulty: str = 'Easy') -> str:
+    def _validate_set(self, set_name: str, cards_data: List[Dict]) -> str:
         # Validate set name
         if not set_name.strip():
             return "Set name cannot be empty"
@@ -22,39 +31,124 @@ class FlashcardController:
         if not cards_data:
             return "At least one flashcard required"
         
+        return ""
+    
+    def _build_set(self, set_name: str, cards_data: List[Dict], difficulty: str) -> FlashcardSet:
         # Convert dictionary data to Flashcard objects with custom hints
         flashcards = []
         for q in cards_data:
             card = Flashcard(q['question'], q['answer'])
             if 'custom_hint' in q:
                 card.custom_hint = q['custom_hint']
+            # Keep the id of a card that already exists
+            if q.get('id'):
+                card.card_id = q['id']
             flashcards.append(card)
         
         # Create flashcard set with difficulty
         flashcard_set = FlashcardSet(set_name, flashcards)
         flashcard_set.difficulty = difficulty
+        return flashcard_set
+    
+    def create_flashcard_set(self, set_name: str, cards_data: List[Dict], difficulty: str = 'Easy') -> str:
+        error = self._validate_set(set_name, cards_data)
+        if error:
+            return error
         
         # Save to file and return result
-        if self.data_manager.save_flashcard_set(flashcard_set):
+        if self.data_manager.save_flashcard_set(self._build_set(set_name, cards_data, difficulty)):
             return ""  # Empty string means success
         else:
             return "Failed to save flashcard set"
     
+    def update_flashcard_set(self, original_name: str, set_name: str, cards_data: List[Dict],
+                             difficulty: str = 'Easy') -> str:
+        """Save edits to an existing set (rename allowed) - returns empty string if success"""
+        error = self._validate_set(set_name, cards_data)
+        if error:
+            return error
+        
+        # Queued answers are keyed by the old set name - write them first
+        self.flush_progress()
+        
+        if self.data_manager.update_flashcard_set(original_name, self._build_set(set_name, cards_data, difficulty)):
+            return ""
+        else:
+            return "Failed to update flashcard set"
+    
     def get_all_sets(self) -> List[Dict]:
         # Return all flashcard sets as dictionaries
         return self.data_manager.load_all_sets_dict()
     
+    def get_set_summaries(self) -> List[Dict]:
+        """Set names, difficulties, dates and card counts for the set list (cards aren't loaded)"""
+        return self.data_manager.load_set_summaries()
+    
+    def get_set_search(self, summaries: List[Dict], on_index_ready=None) -> SetSearch:
+        """Search over the given set summaries, with the full-text index loaded in the background
+
+        on_index_ready is called from the loading thread once the index is in.
+        """
+        return SetSearch(summaries, self.data_manager.get_search_index, on_index_ready)
+    
     def get_study_set(self, set_name: str):
         """Get a set with study progress data"""
-        all_sets = self.data_manager.load_all_sets_dict()
-        for flashcard_set in all_sets:
-            if flashcard_set['set_name'] == set_name:
-                return flashcard_set
-        return None
+        return self.data_manager.get_set_dict(set_name)
 
-    def update_card_progress(self, set_name: str, card_index: int, learned: bool, correct: bool):
+    def count_due_cards(self) -> int:
+        """Cards due for review today across the whole library"""
+        return self.data_manager.count_due_cards()
+
+    def get_due_review_set(self) -> Dict:
+        """Every card due today, from every set, as one study set"""
+        # Answers still queued would change what is due
+        self.flush_progress()
+        return {'set_name': "Due Today", 'review': True, 'cards': self.data_manager.get_due_cards()}
+
+    def get_borrowed_answers(self, set_summary: Dict) -> List[str]:
+        """Answers other sets of the same difficulty can lend as multiple-choice options"""
+        return self.data_manager.get_borrowed_answers(set_summary.get('set_id'), set_summary.get('difficulty'))
+
+    def update_card_progress(self, set_name: str, card_id: str, learned: bool, correct: bool):
         """Update study progress for a card"""
-        return self.data_manager.update_study_progress(set_name, card_index, learned, correct)
+        return self.data_manager.update_study_progress(set_name, card_id, learned, correct)
+
+    def queue_card_progress(self, set_name: str, card_id: str, learned: bool, correct: bool,
+                            schedule: Dict = None):
+        """Queue study progress for a card - written shortly after on a worker thread"""
+        self.progress_writer.record_answer(set_name, card_id, learned, correct, schedule)
+
+    def reset_set_progress(self, set_name: str) -> bool:
+        """Clear study progress for a whole set in one write"""
+        return self.reset_library_progress([set_name])
+
+    def reset_library_progress(self, set_names: List[str] = None) -> bool:
+        """Clear study progress for several sets (the whole library if None) in one write"""
+        # Queued answers would be wiped by the reset anyway; the flush waits out
+        # a batch already being written so it can't land after the reset
+        self.progress_writer.discard(set_names)
+        self.flush_progress()
+        return self.data_manager.reset_library_progress(set_names)
+
+    def flush_progress(self) -> bool:
+        """Write any queued progress and session checkpoints now (e.g. when leaving the study page)"""
+        saved = self.progress_writer.flush()
+        return self.session_store.flush() and saved
+
+    def get_study_session(self, mode: str, set_data: Dict) -> Dict:
+        """Saved state of an unfinished session on this set ("flip" or "mc" mode), or None"""
+        return self.session_store.get(session_key(mode, set_data))
+
+    def checkpoint_study_session(self, mode: str, set_data: Dict, state: Dict):
+        """Remember where a session is (card ids and counters) - written shortly after"""
+        self.session_store.checkpoint(session_key(mode, set_data), state)
+
+    def clear_study_session(self, mode: str, set_data: Dict):
+        self.session_store.clear(session_key(mode, set_data))
+
+    def recover_pending_progress(self) -> bool:
+        """Fold progress left in the journal by a previous session into the saved sets"""
+        return self.data_manager.recover_journal()
 
 
     def delete_flashcard_set(self, set_name: str) -> str:
@@ -62,6 +156,9 @@ class FlashcardController:
         if not set_name.strip():
             return "Set name cannot be empty"
         
+        # Queued progress names this set - write it while the set still exists (records for a deleted set are skipped)
+        self.flush_progress()
+        
         if self.data_manager.delete_flashcard_set(set_name):
             return ""
         else:
@@ -1,142 +1,367 @@
 # FINAL PROJECT FLASHCARD APP / core / data_manager.py
 
 
-import json
 import os
-from typing import List, Dict
+from typing import List, Dict, Optional
 from .flashcard_model import FlashcardSet, Flashcard
+from .storage import get_storage_backend
+from .per_set_index import index_dir
+from .search_index import SearchIndex
+from .due_index import DueIndex
+from .answer_index import AnswerIndex
+from .scheduler import get_schedule, end_of_day
 
 class DataManager:
-    def __init__(self, username=None):
+    def __init__(self, username=None, backend_name=None, storage_format=None):
         self.data_dir = "data"
         self.username = username
-        self.data_file = self._get_user_data_file()
+        self.backend_name = backend_name
+        # "indent", "compact" or "gzip" - None uses app_settings.json
+        self.storage_format = storage_format
         self._ensure_data_directory()
-    
-    def _get_user_data_file(self):
-        """Get the flashcard file path for the current user"""
-        if self.username:
-            return os.path.join(self.data_dir, f"flashcard_sets_{self.username}.json")
-        else:
-            # Fallback to shared file if no username
-            return os.path.join(self.data_dir, "flashcard_sets.json")
+        # Storage backend (JSON file or SQLite) chosen in app_settings.json
+        self.storage = self._open_storage()
     
     def set_username(self, username):
-        """Update the username and data file path"""
+        """Update the username and the storage it points at"""
         self.username = username
-        self.data_file = self._get_user_data_file()
+        self.storage = self._open_storage()
+    
+    def _open_storage(self):
+        return get_storage_backend(self.data_dir, self.username, self.backend_name, self.storage_format)
     
     def _ensure_data_directory(self):
         # Create data directory if it doesn't exist
         os.makedirs(self.data_dir, exist_ok=True)
     
+    def _set_to_dict(self, flashcard_set: FlashcardSet) -> Dict:
+        # Convert flashcard set to dictionary format
+        set_data = {
+            'set_id': flashcard_set.set_id,
+            'set_name': flashcard_set.set_name,
+            'created_date': flashcard_set.created_date,
+            'cards': []
+        }
+        
+        # Add difficulty if exists
+        if hasattr(flashcard_set, 'difficulty'):
+            set_data['difficulty'] = flashcard_set.difficulty
+        
+        # Add cards with custom hints if they exist
+        for card in flashcard_set.cards:
+            card_data = {'id': card.card_id, 'question': card.question, 'answer': card.answer}
+            if hasattr(card, 'custom_hint') and card.custom_hint:
+                card_data['custom_hint'] = card.custom_hint
+            set_data['cards'].append(card_data)
+        
+        return set_data
+    
+    def get_search_index(self):
+        """The user's full-text index, loaded once per process and checked against the library"""
+        return self._load_library_index(SearchIndex.shared(index_dir(self.data_dir, "search_index", self.username)))
+
+    def get_due_index(self):
+        """The user's due-date index, loaded once per process and checked against the library"""
+        index = DueIndex.shared(index_dir(self.data_dir, "due_index", self.username))
+        with index.lock:
+            if not index.loaded:
+                self._load_library_index(index)
+                # Set files are read in no particular order
+                index.follow_order([summary['set_id'] for summary in self.load_set_summaries()])
+            return index
+
+    def get_answer_index(self):
+        """The user's per-difficulty answer index, loaded once per process and checked against the library"""
+        return self._load_library_index(AnswerIndex.shared(index_dir(self.data_dir, "answer_index", self.username)))
+
+    def _library_indexes(self):
+        # Indexes stored one file per set, so a set save, edit or delete rewrites only that set's files
+        return (("Search", self.get_search_index), ("Due", self.get_due_index), ("Answer", self.get_answer_index))
+
+    def _load_library_index(self, index):
+        with index.lock:
+            if index.loaded:
+                return index
+
+            if not index.load():
+                index.rebuild(self.load_all_sets_dict())
+                index.save()
+            else:
+                # Sets added or removed while the index wasn't being maintained
+                # (edits made to a set outside the app aren't detected)
+                summaries = self.load_set_summaries()
+                library_ids = {summary['set_id'] for summary in summaries}
+                for set_id in index.set_ids() - library_ids:
+                    index.remove_set(set_id)
+                    index.save_set(set_id)
+                for summary in summaries:
+                    if summary['set_id'] not in index.set_ids():
+                        set_data = self.get_set_dict(summary['set_name'])
+                        if set_data is not None:
+                            index.update_set(set_data)
+                            index.save_set(set_data['set_id'])
+            index.loaded = True
+            return index
+
+    def _index_set(self, set_data: Dict):
+        # The indexes are secondary - a failure here must never fail the save itself
+        for name, get_index in self._library_indexes():
+            try:
+                index = get_index()
+                with index.lock:
+                    index.update_set(set_data)
+                    index.save_set(set_data['set_id'])
+            except Exception as e:
+                print(f"{name} index error: {e}")
+
+    def _unindex_set(self, set_id):
+        for name, get_index in self._library_indexes():
+            try:
+                index = get_index()
+                with index.lock:
+                    index.remove_set(set_id)
+                    index.save_set(set_id)
+            except Exception as e:
+                print(f"{name} index error: {e}")
+
+    def get_borrowed_answers(self, set_id: str, difficulty: str = None) -> List[str]:
+        """Distinct answers from the other sets of the same difficulty (for small multiple-choice sets)"""
+        try:
+            return self.get_answer_index().answers_for(difficulty or 'Easy', set_id)
+        except Exception as e:
+            print(f"Answer index error: {e}")
+            return []
+
+    def count_due_cards(self, until: float = None) -> int:
+        """How many cards are due for review by until (the end of today if None) - no set is loaded"""
+        try:
+            return self.get_due_index().count_due(until or end_of_day())
+        except Exception as e:
+            print(f"Due index error: {e}")
+            return 0
+
+    def get_due_cards(self, until: float = None) -> List[Dict]:
+        """Cards from every set due by until (the end of today if None), most overdue first
+
+        Each card is a copy tagged with the 'set_name' and 'difficulty' of the set
+        it belongs to. Only sets with something due are loaded.
+        """
+        until = until or end_of_day()
+        try:
+            index = self.get_due_index()
+            entries = index.due_entries(until)
+            set_names = {set_id: index.sets[set_id]['set_name'] for _, set_id, _ in entries}
+        except Exception as e:
+            print(f"Due index error: {e}")
+            return []
+
+        cards_by_set = {}
+        for set_id, set_name in set_names.items():
+            set_data = self.get_set_dict(set_name)
+            cards_by_set[set_id] = {card['id']: (set_data, card)
+                                    for card in set_data['cards']} if set_data else {}
+
+        due_cards = []
+        seen = set()
+        for _, set_id, card_id in entries:
+            found = cards_by_set[set_id].get(card_id)
+            # Copied sets can share card ids - the study page keys cards by id
+            if found is None or card_id in seen:
+                continue
+            set_data, card = found
+            # The saved schedule is the truth if the index has fallen behind
+            if get_schedule(card)['due'] > until:
+                continue
+            seen.add(card_id)
+            # The review set mixes difficulties, so each card carries its own
+            due_cards.append(dict(card, set_name=set_data['set_name'],
+                                  difficulty=card.get('difficulty') or set_data.get('difficulty', 'Easy')))
+        return due_cards
+
+    def search_cards(self, query: str, limit: int = 50) -> List[Dict]:
+        """Ranked full-text hits ({'set_id', 'card_id', 'score'}) across the whole library"""
+        try:
+            return self.get_search_index().search(query, limit)
+        except Exception as e:
+            print(f"Search error: {e}")
+            return []
+
     def save_flashcard_set(self, flashcard_set: FlashcardSet) -> bool:
         try:
-            # Read existing sets from file
-            all_sets = self.load_all_sets_dict()
-            
-            # Convert flashcard set to dictionary format
-            set_data = {
-                'set_name': flashcard_set.set_name,
-                'created_date': flashcard_set.created_date,
-                'cards': []
-            }
-            
-            # Add difficulty if exists
-            if hasattr(flashcard_set, 'difficulty'):
-                set_data['difficulty'] = flashcard_set.difficulty
-            
-            # Add cards with custom hints if they exist
-            for card in flashcard_set.cards:
-                card_data = {'question': card.question, 'answer': card.answer}
-                if hasattr(card, 'custom_hint') and card.custom_hint:
-                    card_data['custom_hint'] = card.custom_hint
-                set_data['cards'].append(card_data)
-            
             # Add new set to existing sets
-            all_sets.append(set_data)
+            set_data = self._set_to_dict(flashcard_set)
+            self.storage.add_set(set_data)
+            self._index_set(set_data)
+            return True
+        except Exception as e:
+            print(f"Save error: {e}")
+            return False
+    
+    def update_flashcard_set(self, original_name: str, flashcard_set: FlashcardSet) -> bool:
+        """Replace a saved set (possibly renamed) in one write, keeping progress of unchanged cards"""
+        try:
+            old_set = self.storage.get_set(original_name)
+            if old_set is None:
+                return False
             
-            # Write all sets back to JSON file
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(all_sets, f, indent=4, ensure_ascii=False)
+            set_data = self._set_to_dict(flashcard_set)
+            # The set keeps its identity and creation date across edits
+            set_data['set_id'] = old_set.get('set_id', set_data['set_id'])
+            set_data['created_date'] = old_set.get('created_date', set_data['created_date'])
+            merge_card_progress(old_set['cards'], set_data['cards'])
             
+            if not self.storage.replace_set(original_name, set_data):
+                return False
+            if set_data['set_id'] != old_set.get('set_id'):
+                self._unindex_set(old_set.get('set_id'))
+            self._index_set(set_data)
             return True
         except Exception as e:
-            print(f"Save error: {e}")
+            print(f"Update error: {e}")
             return False
     
     def load_all_sets_dict(self) -> List[Dict]:
-        # Return empty list if file doesn't exist
-        if not os.path.exists(self.data_file):
+        try:
+            return self.storage.load_all_sets()
+        except Exception as e:
+            print(f"Load error: {e}")
             return []
-        
+
+    def load_set_summaries(self) -> List[Dict]:
+        """Per-set name, difficulty, created date and card counts - no card bodies"""
         try:
-            # Load and return all sets from JSON file
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            # Return empty list if file is corrupted
+            return self.storage.load_set_summaries()
+        except Exception as e:
+            print(f"Load error: {e}")
             return []
 
+    def get_set_dict(self, set_name: str) -> Optional[Dict]:
+        """Load a single set by name (None if it doesn't exist)"""
+        try:
+            return self.storage.get_set(set_name)
+        except Exception as e:
+            print(f"Load error: {e}")
+            return None
+
     def _save_all_sets(self, all_sets):
-        """Save all flashcard sets to the JSON file"""
+        """Save all flashcard sets to storage"""
         try:
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(all_sets, f, indent=4, ensure_ascii=False)
+            self.storage.save_all_sets(all_sets)
+            for index in (self.get_search_index(), self.get_due_index(), self.get_answer_index()):
+                with index.lock:
+                    index.rebuild(all_sets)
+                    index.save()
             return True
         except Exception as e:
             print(f"Error saving flashcard sets: {e}")
             return False
 
-    def update_study_progress(self, set_name: str, card_index: int, learned: bool, correct: bool):
-        """Update progress for a specific card in a set"""
+    def compact_journal(self) -> bool:
+        """Fold pending progress events into the saved sets"""
         try:
-            
-            all_sets = self.load_all_sets_dict()
-            
-            for flashcard_set in all_sets:
-                if flashcard_set['set_name'] == set_name:
-                    
-                    if card_index >= len(flashcard_set['cards']):
-                        return False
-                    
-                    if 'progress' not in flashcard_set['cards'][card_index]:
-                        flashcard_set['cards'][card_index]['progress'] = {
-                            'learned': False,
-                            'times_correct': 0,
-                            'times_wrong': 0
-                        }
-                    
-                    if correct:
-                        flashcard_set['cards'][card_index]['progress']['times_correct'] += 1
-                    else:
-                        flashcard_set['cards'][card_index]['progress']['times_wrong'] += 1
-                    
-                    flashcard_set['cards'][card_index]['progress']['learned'] = learned
-                    
-                    self._save_all_sets(all_sets)
-                    return True
-            
+            self.storage.compact()
+            return True
+        except Exception as e:
+            print(f"Error compacting progress journal: {e}")
             return False
-            
+
+    def recover_journal(self) -> bool:
+        """Replay whatever the journal holds from a previous run (called on login)"""
+        return self.compact_journal()
+
+    def update_study_progress(self, set_name: str, card_id: str, learned: bool, correct: bool):
+        """Update progress for a specific card in a set"""
+        try:
+            return self.storage.update_progress(set_name, card_id, learned, correct)
         except Exception as e:
             import traceback
             traceback.print_exc()
             return False
 
+    def apply_progress_batch(self, records: List[Dict]) -> bool:
+        """Write a batch of queued progress records in a single storage write"""
+        try:
+            if not self.storage.apply_progress_batch(records):
+                return False
+        except Exception as e:
+            print(f"Error saving study progress: {e}")
+            return False
+        self._record_due_dates(records)
+        return True
+
+    def _record_due_dates(self, records: List[Dict]):
+        # Keeps the review queue in step with answers without reloading any set
+        try:
+            index = self.get_due_index()
+            with index.lock:
+                # Only the studied sets' files are rewritten
+                for set_id in index.apply_records(records):
+                    index.save_set(set_id)
+        except Exception as e:
+            print(f"Due index error: {e}")
+
+    def reset_set_progress(self, set_name: str) -> bool:
+        """Clear study progress for every card in one set with a single write"""
+        return self.reset_library_progress([set_name])
+
+    def reset_library_progress(self, set_names: Optional[List[str]] = None) -> bool:
+        """Clear study progress for several sets (all of them if None) with a single write"""
+        try:
+            if not self.storage.reset_progress(set_names):
+                return False
+        except Exception as e:
+            print(f"Error resetting study progress: {e}")
+            return False
+        try:
+            index = self.get_due_index()
+            with index.lock:
+                for set_id in index.reset_sets(set_names):
+                    index.save_set(set_id)
+        except Exception as e:
+            print(f"Due index error: {e}")
+        return True
 
     def delete_flashcard_set(self, set_name: str) -> bool:
         """Delete a flashcard set by name"""
         try:
-            all_sets = self.load_all_sets_dict()
-            
-            # Find and remove the set
-            for i, flashcard_set in enumerate(all_sets):
-                if flashcard_set['set_name'] == set_name:
-                    all_sets.pop(i)
-                    self._save_all_sets(all_sets)
-                    return True
-            return False
+            set_data = self.storage.get_set(set_name)
+            if not self.storage.delete_set(set_name):
+                return False
+            if set_data is not None:
+                self._unindex_set(set_data.get('set_id'))
+            return True
         except Exception as e:
             print(f"Delete error: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+
+def merge_card_progress(old_cards: List[Dict], new_cards: List[Dict]):
+    """Carry ids and progress from the saved cards over to their edited versions
+    
+    A card is matched by id first, then by identical question and answer. Progress
+    survives only if the question and answer are unchanged (hint edits are fine).
+    """
+    old_by_id = {card.get('id'): card for card in old_cards}
+    unmatched_by_text = {}
+    for card in old_cards:
+        unmatched_by_text.setdefault((card['question'], card['answer']), []).append(card)
+    
+    # Ids the form sent back that really belong to saved cards
+    claimed = {card['id'] for card in new_cards if card.get('id') in old_by_id}
+    
+    for card in new_cards:
+        old_card = old_by_id.get(card.get('id'))
+        if old_card is None:
+            # Form didn't know the card - look for an identical saved card not already matched
+            for candidate in unmatched_by_text.get((card['question'], card['answer']), []):
+                if candidate.get('id') not in claimed:
+                    old_card = candidate
+                    card['id'] = candidate.get('id', card['id'])
+                    claimed.add(card['id'])
+                    break
+        
+        if old_card is None:
+            continue
+        if 'progress' in old_card and (old_card['question'], old_card['answer']) == (card['question'], card['answer']):
+            card['progress'] = dict(old_card['progress'])
@@ -0,0 +1,147 @@
+# FINAL PROJECT FLASHCARD APP / core / distractors.py
+
+import heapq
+import random
+import re
+from collections import Counter
+from typing import List, Dict, Iterable
+
+# Wrong options shown next to the correct answer
+DISTRACTOR_COUNT = 3
+
+# Hard mode: wrong options are drawn from this many answers most like the correct one
+HARD_CANDIDATES = 8
+# Rarest features of an answer that are looked up (keeps long answers cheap)
+MAX_QUERY_FEATURES = 24
+# How much the length ratio counts next to shared words/trigrams
+LENGTH_WEIGHT = 0.2
+
+WORD_RE = re.compile(r"\w+")
+
+
+def answer_features(answer: str) -> set:
+    """Words and padded character trigrams of an answer, case-folded"""
+    text = answer.casefold()
+    features = {"w:" + word for word in WORD_RE.findall(text)}
+    padded = f"  {' '.join(text.split())} "
+    features.update("g:" + padded[i:i + 3] for i in range(len(padded) - 2))
+    return features
+
+
+class SimilarityIndex:
+    """Inverted index from answer features to answers, for finding look-alike answers
+
+    Built once per set; each answer's ranked neighbours are worked out the first
+    time it is asked for and then kept.
+    """
+
+    def __init__(self, answers: List[str]):
+        self.answers = answers
+        self.features = [answer_features(answer) for answer in answers]
+        self.postings: Dict[str, List[int]] = {}
+        for i, features in enumerate(self.features):
+            for feature in features:
+                self.postings.setdefault(feature, []).append(i)
+        self._neighbours: Dict[int, List[int]] = {}
+
+    def similar(self, i: int, limit=HARD_CANDIDATES) -> List[int]:
+        """Positions of the answers most like answer i, most similar first"""
+        if i in self._neighbours:
+            return self._neighbours[i]
+
+        # Rare features say the most and have the shortest lists to walk
+        features = sorted(self.features[i], key=lambda feature: len(self.postings[feature]))[:MAX_QUERY_FEATURES]
+        shared = Counter()
+        for feature in features:
+            shared.update(self.postings[feature])
+        shared.pop(i, None)
+
+        length = len(self.answers[i])
+
+        def score(j):
+            overlap = shared[j] / (len(features) + len(self.features[j]) - shared[j])
+            other_length = len(self.answers[j])
+            length_ratio = min(length, other_length) / max(length, other_length, 1)
+            return (1 - LENGTH_WEIGHT) * overlap + LENGTH_WEIGHT * length_ratio
+
+        self._neighbours[i] = heapq.nlargest(limit, shared, key=score)
+        return self._neighbours[i]
+
+
+class DistractorPool:
+    """A set's distinct answers, built once per quiz, for drawing wrong options
+
+    Sampling picks random positions and skips the correct answer and repeats,
+    so a question costs O(1) expected time however big the set is. Answers
+    borrowed from other sets only fill in when the set's own run out.
+    """
+
+    def __init__(self, answers: Iterable[str], borrowed: Iterable[str] = ()):
+        # dict.fromkeys drops repeats but keeps the set's order
+        self.answers = list(dict.fromkeys(answers))
+        self.positions = {answer: i for i, answer in enumerate(self.answers)}
+        self.borrowed = [answer for answer in dict.fromkeys(borrowed) if answer not in self.positions]
+        self._similarity = None  # Built the first time hard options are asked for
+
+    @classmethod
+    def from_set(cls, flashcard_set: Dict, borrowed: Iterable[str] = ()) -> "DistractorPool":
+        return cls((card['answer'] for card in flashcard_set.get('cards', [])), borrowed)
+
+    def __len__(self):
+        return len(self.answers)
+
+    def sample(self, correct_answer: str, count=DISTRACTOR_COUNT, rng=random) -> List[str]:
+        """Up to count distinct answers other than correct_answer"""
+        picks = self._sample_own(correct_answer, count, rng)
+        if len(picks) < count and self.borrowed:
+            picks += _sample_list(self.borrowed, count - len(picks), rng)
+        return picks
+
+    def _sample_own(self, correct_answer, count, rng) -> List[str]:
+        excluded = self.positions.get(correct_answer)
+        available = len(self.answers) - (excluded is not None)
+        if available <= 2 * count:
+            # Small pool - rejection would retry a lot, and the list is tiny anyway
+            others = [answer for answer in self.answers if answer != correct_answer]
+            return rng.sample(others, min(count, len(others)))
+
+        # At least half the pool is usable, so each draw succeeds with probability >= 1/2
+        chosen = set()
+        picks = []
+        while len(picks) < count:
+            i = rng.randrange(len(self.answers))
+            if i != excluded and i not in chosen:
+                chosen.add(i)
+                picks.append(self.answers[i])
+        return picks
+
+    def sample_hard(self, correct_answer: str, count=DISTRACTOR_COUNT, rng=random) -> List[str]:
+        """Up to count wrong answers chosen among those most like correct_answer
+
+        Topped up with random answers when too few look alike.
+        """
+        i = self.positions.get(correct_answer)
+        if i is None:
+            return self.sample(correct_answer, count, rng)
+        if self._similarity is None:
+            self._similarity = SimilarityIndex(self.answers)
+
+        neighbours = self._similarity.similar(i)
+        picks = [self.answers[j] for j in rng.sample(neighbours, min(count, len(neighbours)))]
+        if len(picks) < count:
+            for answer in self.sample(correct_answer, count + len(picks), rng):
+                if answer not in picks:
+                    picks.append(answer)
+                    if len(picks) == count:
+                        break
+        return picks
+
+
+def _sample_list(items: List[str], count: int, rng) -> List[str]:
+    """Up to count distinct items, by rejection unless the list is small"""
+    if len(items) <= 2 * count:
+        return rng.sample(items, min(count, len(items)))
+    chosen = set()
+    while len(chosen) < count:
+        chosen.add(rng.randrange(len(items)))
+    return [items[i] for i in chosen]
@@ -0,0 +1,143 @@
+# FINAL PROJECT FLASHCARD APP / core / due_index.py
+
+import bisect
+import heapq
+from typing import List, Dict, Optional
+from .per_set_index import PerSetIndex
+
+
+class DueIndex(PerSetIndex):
+    """When every reviewed card in the library is next due, grouped by set and kept sorted
+
+    Building the day's review queue only reads this index and then opens the
+    sets that actually have cards due. Cards never reviewed aren't listed, and
+    an answer only rewrites the file of the set it belongs to.
+    """
+
+    def __init__(self, directory=None):
+        super().__init__(directory)
+        self.sets: Dict[str, Dict] = {}  # Set id -> {'set_name', 'due': sorted [(due, card id)]}
+        self.names: Dict[str, List[str]] = {}  # Set name -> ids of the sets with that name
+        self.card_dues: Dict[str, Dict[str, float]] = {}  # Set id -> {card id: due}
+
+    def _add_entry(self, set_id, set_name, dues: Dict[str, float]):
+        self.sets[set_id] = {'set_name': set_name, 'due': sorted((due, card_id) for card_id, due in dues.items())}
+        self.card_dues[set_id] = dues
+        self.names.setdefault(set_name, []).append(set_id)
+
+    def update_set(self, set_data: Dict):
+        """(Re-)index one set's cards"""
+        dues = {}
+        for card in set_data['cards']:
+            due = (card.get('progress') or {}).get('due')
+            if due is not None:
+                dues[card['id']] = due
+        with self.lock:
+            self.remove_set(set_data['set_id'])
+            self._add_entry(set_data['set_id'], set_data['set_name'], dues)
+
+    def remove_set(self, set_id):
+        with self.lock:
+            entry = self.sets.pop(set_id, None)
+            self.card_dues.pop(set_id, None)
+            if entry is not None:
+                set_ids = self.names[entry['set_name']]
+                set_ids.remove(set_id)
+                if not set_ids:
+                    del self.names[entry['set_name']]
+
+    def rebuild(self, all_sets: List[Dict]):
+        with self.lock:
+            self.sets, self.names, self.card_dues = {}, {}, {}
+            for set_data in all_sets:
+                self.update_set(set_data)
+
+    def set_ids(self) -> set:
+        return set(self.sets)
+
+    def follow_order(self, set_ids: List[str]):
+        """Put sets sharing a name in library order, so a name finds the same set storage does"""
+        positions = {set_id: i for i, set_id in enumerate(set_ids)}
+        with self.lock:
+            for ids in self.names.values():
+                if len(ids) > 1:
+                    ids.sort(key=lambda set_id: positions.get(set_id, len(positions)))
+
+    def _find_set(self, set_name, card_id=None) -> Optional[str]:
+        """Id of the set a record names - with duplicate names, the one holding the card"""
+        set_ids = self.names.get(set_name)
+        if not set_ids:
+            return None
+        if card_id is not None and len(set_ids) > 1:
+            for set_id in set_ids:
+                if card_id in self.card_dues[set_id]:
+                    return set_id
+        return set_ids[0]
+
+    def _set_card_due(self, set_id, card_id, due: Optional[float]):
+        """Move one card to its new due time (None takes it out) - a bisect, not a re-sort"""
+        entries = self.sets[set_id]['due']
+        dues = self.card_dues[set_id]
+        old_due = dues.pop(card_id, None)
+        if old_due is not None:
+            i = bisect.bisect_left(entries, (old_due, card_id))
+            if i < len(entries) and entries[i] == (old_due, card_id):
+                del entries[i]
+        if due is not None:
+            dues[card_id] = due
+            bisect.insort(entries, (due, card_id))
+
+    def apply_records(self, records: List[Dict]) -> set:
+        """Follow a batch of progress records - returns the ids of the sets whose due times changed"""
+        changed = set()
+        with self.lock:
+            for record in records:
+                if 'card' not in record:
+                    set_id = self._find_set(record.get('set'))
+                    if set_id is not None and record.get('reset'):
+                        self.sets[set_id]['due'] = []
+                        self.card_dues[set_id] = {}
+                        changed.add(set_id)
+                    continue
+                if isinstance(record['card'], int):
+                    # Position-keyed records predate the scheduler
+                    continue
+                set_id = self._find_set(record.get('set'), record['card'])
+                if set_id is None:
+                    continue
+                if 'schedule' in record:
+                    self._set_card_due(set_id, record['card'], record['schedule']['due'])
+                    changed.add(set_id)
+                elif record.get('reset'):
+                    self._set_card_due(set_id, record['card'], None)
+                    changed.add(set_id)
+        return changed
+
+    def reset_sets(self, set_names: Optional[List[str]] = None) -> set:
+        """Forget due times of the given sets (every set if None) - returns the ids of the sets changed"""
+        with self.lock:
+            return self.apply_records([{'set': name, 'reset': True}
+                                       for name in (list(self.names) if set_names is None else set_names)])
+
+    def due_entries(self, until: float) -> List[tuple]:
+        """(due, set id, card id) of every card due by until, most overdue first"""
+        with self.lock:
+            per_set = []
+            for set_id, entry in self.sets.items():
+                end = bisect.bisect_right(entry['due'], (until, "\U0010ffff"))
+                if end:
+                    per_set.append([(due, set_id, card_id) for due, card_id in entry['due'][:end]])
+            return list(heapq.merge(*per_set))
+
+    def count_due(self, until: float) -> int:
+        with self.lock:
+            return sum(bisect.bisect_right(entry['due'], (until, "\U0010ffff")) for entry in self.sets.values())
+
+    def encode_set(self, set_id) -> Dict:
+        entry = self.sets[set_id]
+        return {'set_name': entry['set_name'], 'due': entry['due']}
+
+    def decode_sets(self, payloads: Dict[str, Dict]):
+        self.sets, self.names, self.card_dues = {}, {}, {}
+        for set_id, data in payloads.items():
+            self._add_entry(set_id, data['set_name'], {card_id: due for due, card_id in data['due']})
@@ -1,20 +1,28 @@
 # FINAL PROJECT FLASHCARD APP / core / flashcard_model.py
 
-from dataclasses import dataclass
+import secrets
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List
+from typing import List, Dict
+
+def new_id() -> str:
+    """Short random id (8 url-safe characters) for a card or set"""
+    return secrets.token_urlsafe(6)
 
 @dataclass
 class Flashcard:
     question: str
     answer: str
     custom_hint: str = None
+    # Stable key for progress - survives shuffling, reordering and edits
+    card_id: str = field(default_factory=new_id)
 
 @dataclass  
 class FlashcardSet:
     set_name: str
     cards: List[Flashcard]
     created_date: str = None
+    set_id: str = field(default_factory=new_id)
     
     def __post_init__(self):
         if self.created_date is None:
@@ -25,6 +33,11 @@ class StudyProgress:
     learned: bool = False
     times_correct: int = 0
     times_wrong: int = 0
+    # Review schedule (see core.scheduler) - due is a Unix timestamp, 0 for new cards
+    ease: float = 2.5
+    interval: float = 0
+    repetitions: int = 0
+    due: float = 0
 
 @dataclass
 class StudyFlashcard(Flashcard):
@@ -32,4 +45,19 @@ class StudyFlashcard(Flashcard):
     
     def __post_init__(self):
         if self.progress is None:
-            self.progress = StudyProgress()
\ No newline at end of file
+            self.progress = StudyProgress()
+
+def assign_missing_ids(set_data: Dict) -> bool:
+    """Give a saved set and its cards ids if they lack them (or share one) - returns True if changed"""
+    changed = False
+    if not set_data.get('set_id'):
+        set_data['set_id'] = new_id()
+        changed = True
+
+    seen = set()
+    for card in set_data['cards']:
+        if not card.get('id') or card['id'] in seen:
+            card['id'] = new_id()
+            changed = True
+        seen.add(card['id'])
+    return changed
@@ -0,0 +1,152 @@
+# FINAL PROJECT FLASHCARD APP / core / hints.py
+
+import re
+import threading
+from typing import List, Dict, Callable, Optional
+from utils.file_helper import load_app_settings
+
+# Single words up to this long are revealed letter by letter, longer answers word by word
+LETTER_HINT_MAX_LENGTH = 20
+# Words this short are never blanked out by the cloze strategy
+CLOZE_MIN_KEYWORD_LENGTH = 4
+CLOZE_STOPWORDS = {"the", "and", "that", "with", "from", "this", "these", "those", "which", "there",
+                   "their", "into", "have", "been", "were", "when", "what", "where", "also", "than"}
+# Plans kept in memory before the cache starts over
+MAX_CACHED_PLANS = 50000
+
+HINT_PREFIX = "<b>Hint:</b> "
+NO_HINT = HINT_PREFIX + "No hint available"
+
+
+def letter_hints(answer: str) -> List[str]:
+    """One more letter per step: "P a _ _ _" ... "Paris" """
+    word = answer.strip()
+    steps = []
+    for level in range(1, len(word) + 1):
+        if level >= len(word):
+            steps.append(HINT_PREFIX + word)
+        else:
+            steps.append(f"{HINT_PREFIX}{word[:level]} {' '.join(['_'] * (len(word) - level))}")
+    return steps
+
+
+def word_hints(answer: str) -> List[str]:
+    """One more word per step, blanks for the rest"""
+    words = answer.split()
+    steps = []
+    for level in range(1, len(words) + 1):
+        if level >= len(words):
+            steps.append(HINT_PREFIX + " ".join(words))
+        else:
+            blanks = " ".join(["_____"] * (len(words) - level))
+            steps.append(f"{HINT_PREFIX}{' '.join(words[:level])} {blanks}")
+    return steps
+
+
+def cloze_hints(answer: str) -> List[str]:
+    """Keywords blanked out first, then filled back in from the shortest to the longest"""
+    words = answer.split()
+    keywords = [i for i, word in enumerate(words)
+                if len(re.sub(r"\W", "", word)) >= CLOZE_MIN_KEYWORD_LENGTH
+                and re.sub(r"\W", "", word).casefold() not in CLOZE_STOPWORDS]
+    if not keywords:
+        return word_hints(answer)
+
+    hidden = set(keywords)
+    steps = []
+    # Longest words say the most, so they are given away last
+    for i in [None] + sorted(keywords, key=lambda i: len(words[i])):
+        hidden.discard(i)
+        steps.append(HINT_PREFIX + " ".join("_____" if j in hidden else word for j, word in enumerate(words)))
+    return steps
+
+
+def first_letter_hints(answer: str) -> List[str]:
+    """First letter of each word, then the whole answer"""
+    words = answer.split()
+    initials = " ".join(word[0] + "_" * (len(word) - 1) for word in words)
+    return [HINT_PREFIX + initials, HINT_PREFIX + " ".join(words)]
+
+
+def auto_hints(answer: str) -> List[str]:
+    """Letters for a short single word, words for anything longer"""
+    words = answer.split()
+    if len(words) == 1 and len(answer.strip()) <= LETTER_HINT_MAX_LENGTH:
+        return letter_hints(answer)
+    return word_hints(answer)
+
+
+# Strategy name -> answer -> hint text for each step (the last usually gives the answer away)
+HINT_STRATEGIES: Dict[str, Callable[[str], List[str]]] = {
+    "auto": auto_hints,
+    "letter": letter_hints,
+    "word": word_hints,
+    "cloze": cloze_hints,
+    "first_letters": first_letter_hints
+}
+DEFAULT_HINT_STRATEGY = "auto"
+
+
+def get_hint_strategy() -> str:
+    """Hint strategy chosen in app_settings.json ("hint_strategy")"""
+    strategy = load_app_settings().get("hint_strategy", DEFAULT_HINT_STRATEGY)
+    return strategy if strategy in HINT_STRATEGIES else DEFAULT_HINT_STRATEGY
+
+
+class HintEngine:
+    """Hint steps for each card, worked out once and cached by card id and answer
+
+    A card's own custom hint is its only step. Editing the answer (or hint)
+    changes the key, so a stale plan is never shown.
+    """
+
+    def __init__(self, strategy: Optional[str] = None):
+        self.strategy = strategy or get_hint_strategy()
+        self._plans: Dict[tuple, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, card: Dict) -> tuple:
+        return card.get('id'), hash((card.get('answer'), card.get('custom_hint'), self.strategy))
+
+    def _build(self, card: Dict) -> List[str]:
+        if card.get('custom_hint'):
+            return [HINT_PREFIX + card['custom_hint']]
+        answer = card.get('answer')
+        if not isinstance(answer, str) or not answer.strip():
+            return [NO_HINT]
+        try:
+            return HINT_STRATEGIES[self.strategy](answer.strip()) or [NO_HINT]
+        except Exception as e:
+            print(f"Error building hints: {e}")
+            return [NO_HINT]
+
+    def plan(self, card: Dict) -> List[str]:
+        """Hint text for each step of this card"""
+        key = self._key(card)
+        with self._lock:
+            steps = self._plans.get(key)
+        if steps is None:
+            steps = self._build(card)
+            with self._lock:
+                if len(self._plans) >= MAX_CACHED_PLANS:
+                    self._plans = {}
+                self._plans[key] = steps
+        return steps
+
+    def warm(self, cards: List[Dict]):
+        """Work out every card's plan up front, e.g. when a set is opened"""
+        for card in cards:
+            self.plan(card)
+
+
+# One engine per hint strategy for the whole process
+_engines: Dict[str, HintEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_hint_engine(strategy: Optional[str] = None) -> HintEngine:
+    strategy = strategy or get_hint_strategy()
+    with _engines_lock:
+        if strategy not in _engines:
+            _engines[strategy] = HintEngine(strategy)
+        return _engines[strategy]
@@ -0,0 +1,180 @@
+# FINAL PROJECT FLASHCARD APP / core / journal.py
+
+import glob
+import json
+import os
+from typing import List, Dict, Optional
+from utils.file_helper import append_text
+
+
+class ProgressJournal:
+    """Append-only log of study progress events that sits next to a flashcard file"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def append(self, record: Dict):
+        self.append_many([record])
+
+    def append_many(self, records: List[Dict]):
+        # One compact JSON object per line so a click only writes a few bytes
+        lines = [json.dumps(record, ensure_ascii=False, separators=(',', ':')) for record in records]
+        append_text(self.path, "".join(line + "\n" for line in lines))
+
+    def size(self) -> int:
+        """Size of the journal in bytes (0 if there is no journal yet)"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def read_records(self, path=None) -> List[Dict]:
+        """Read every complete record, skipping a torn line left by a crash"""
+        path = path or self.path
+        if not os.path.exists(path):
+            return []
+
+        records = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    # Last write never finished - ignore it
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'base' not in record:
+                    records.append(record)
+        return records
+
+    def _rotated_paths(self) -> List[str]:
+        suffixes = [path[len(self.path) + 1:] for path in glob.glob(glob.escape(self.path) + ".*")]
+        return [f"{self.path}.{n}" for n in sorted(int(suffix) for suffix in suffixes if suffix.isdigit())]
+
+    def _base_of(self, path) -> Optional[list]:
+        """Snapshot a rotated journal was moved aside from (None if the marker never got written)"""
+        base = None
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('{"base"') and line.endswith("\n"):
+                    try:
+                        base = json.loads(line)['base']
+                    except ValueError:
+                        continue
+        return base
+
+    def rotate(self, snapshot_path):
+        """Move the journal aside before its records are folded into a new snapshot
+
+        The rotated file is tagged with the snapshot it applies on top of, so
+        after a crash it is replayed only if that snapshot was never replaced.
+        """
+        if self.size() == 0:
+            return
+        self.append({'base': snapshot_id(snapshot_path)})
+        rotated = self._rotated_paths()
+        next_number = int(rotated[-1].rsplit(".", 1)[1]) + 1 if rotated else 1
+        os.replace(self.path, f"{self.path}.{next_number}")
+
+    def has_rotated(self) -> bool:
+        return bool(self._rotated_paths())
+
+    def read_pending_records(self, snapshot_path) -> List[Dict]:
+        """Records not yet in the snapshot: rotated journals a crash left behind, then the journal itself"""
+        records = []
+        current = snapshot_id(snapshot_path)
+        if current is None:
+            # Loading falls back to the backup - the version the journal was rotated against
+            current = snapshot_id(snapshot_path + ".bak")
+        for path in self._rotated_paths():
+            base = self._base_of(path)
+            if base is None or base == current:
+                records.extend(self.read_records(path))
+        return records + self.read_records()
+
+    def clear(self):
+        """Drop the journal (and rotated journals) once its records are folded into the snapshot"""
+        for path in self._rotated_paths() + [self.path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def snapshot_id(path) -> Optional[list]:
+    """Identity of a snapshot file - a replacing rename always changes it"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_ino, stat.st_mtime_ns, stat.st_size]
+
+
+def build_card_index(all_sets: List[Dict]) -> Dict[str, tuple]:
+    """Map set name -> (set, {card id: card}) so records apply without scanning"""
+    index = {}
+    for flashcard_set in all_sets:
+        # Set names aren't unique - the first set with a name wins, as in lookups
+        if flashcard_set['set_name'] not in index:
+            cards_by_id = {card.get('id'): card for card in flashcard_set['cards']}
+            index[flashcard_set['set_name']] = (flashcard_set, cards_by_id)
+    return index
+
+
+def apply_progress_record(card_index: Dict[str, tuple], record: Dict) -> bool:
+    """Replay one journal record through a build_card_index() map - returns False if it no longer applies"""
+    entry = card_index.get(record.get('set'))
+    if entry is None:
+        return False
+    flashcard_set, cards_by_id = entry
+
+    # A reset without a card clears the whole set
+    if 'card' not in record:
+        if not record.get('reset'):
+            return False
+        for card in flashcard_set['cards']:
+            card.pop('progress', None)
+        return True
+
+    key = record['card']
+    if isinstance(key, int):
+        # Journals written before cards had ids refer to them by position
+        if not 0 <= key < len(flashcard_set['cards']):
+            return False
+        card = flashcard_set['cards'][key]
+    else:
+        card = cards_by_id.get(key)
+        if card is None:
+            return False
+
+    if record.get('reset'):
+        card.pop('progress', None)
+
+    # Nothing answered after the reset - the card is new again
+    if not ('correct' in record or 'learned' in record or 'schedule' in record
+            or record.get('add_correct') or record.get('add_wrong')):
+        return True
+
+    if 'progress' not in card:
+        card['progress'] = {
+            'learned': False,
+            'times_correct': 0,
+            'times_wrong': 0
+        }
+
+    if 'correct' in record:
+        # Single answer (the only record kind older journals contain)
+        if record['correct']:
+            card['progress']['times_correct'] += 1
+        else:
+            card['progress']['times_wrong'] += 1
+    else:
+        # Batched answers coalesced by the progress writer
+        card['progress']['times_correct'] += record.get('add_correct', 0)
+        card['progress']['times_wrong'] += record.get('add_wrong', 0)
+
+    if 'learned' in record:
+        card['progress']['learned'] = record['learned']
+    if 'schedule' in record:
+        # ease / interval / repetitions / due from core.scheduler
+        card['progress'].update(record['schedule'])
+    return True
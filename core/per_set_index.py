@@ -0,0 +1,104 @@
+# FINAL PROJECT FLASHCARD APP / core / per_set_index.py
+
+import os
+import threading
+from typing import Dict
+from utils.file_helper import atomic_write_json, read_json_with_backup
+
+
+def index_dir(data_dir, name, username=None) -> str:
+    """Directory of one of a user's library indexes, e.g. data/search_index_<username>"""
+    return os.path.join(data_dir, f"{name}_{username}" if username else name)
+
+
+class PerSetIndex:
+    """Base for library indexes kept one file per set (<directory>/<set id>.json)
+
+    Saving a set only rewrites that set's file. Subclasses hold the in-memory
+    index and provide the per-set payload through encode_set/decode_sets.
+    """
+
+    version = 1
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.loaded = False
+        self.lock = threading.RLock()
+
+    def set_ids(self) -> set:
+        raise NotImplementedError
+
+    def encode_set(self, set_id) -> Dict:
+        """What goes in one set's file"""
+        raise NotImplementedError
+
+    def decode_sets(self, payloads: Dict[str, Dict]):
+        """Replace the in-memory index with the files read back (set id -> payload)"""
+        raise NotImplementedError
+
+    def _set_file(self, set_id) -> str:
+        return os.path.join(self.directory, f"{set_id}.json")
+
+    def save_set(self, set_id):
+        """Write one set's file (or remove it if the set is no longer indexed)"""
+        if not self.directory:
+            return
+        with self.lock:
+            path = self._set_file(set_id)
+            if set_id not in self.set_ids():
+                if os.path.exists(path):
+                    os.remove(path)
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            atomic_write_json(path, dict(self.encode_set(set_id), version=self.version),
+                              "compact", ensure_ascii=False)
+
+    def save(self):
+        """Write every set's file and drop files of sets no longer indexed"""
+        if not self.directory:
+            return
+        with self.lock:
+            set_ids = self.set_ids()
+            for set_id in set_ids:
+                self.save_set(set_id)
+            if os.path.isdir(self.directory):
+                for file_name in os.listdir(self.directory):
+                    set_id, extension = os.path.splitext(file_name)
+                    if extension == ".json" and set_id not in set_ids:
+                        os.remove(os.path.join(self.directory, file_name))
+
+    def load(self) -> bool:
+        """Read the saved index - returns False if there is none (or any part is outdated/damaged)"""
+        if not self.directory or not os.path.isdir(self.directory):
+            return False
+
+        payloads = {}
+        for file_name in os.listdir(self.directory):
+            set_id, extension = os.path.splitext(file_name)
+            if extension != ".json":
+                continue
+            try:
+                data = read_json_with_backup(os.path.join(self.directory, file_name))
+            except ValueError:
+                return False
+            if not data or data.pop('version', None) != self.version:
+                return False
+            payloads[set_id] = data
+
+        with self.lock:
+            self.decode_sets(payloads)
+        return True
+
+    @classmethod
+    def shared(cls, directory) -> "PerSetIndex":
+        """The one index for this directory in the whole process"""
+        key = (cls, os.path.abspath(directory))
+        with _indexes_lock:
+            if key not in _indexes:
+                _indexes[key] = cls(directory)
+            return _indexes[key]
+
+
+# (index class, directory) -> index
+_indexes: Dict[tuple, PerSetIndex] = {}
+_indexes_lock = threading.Lock()
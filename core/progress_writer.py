@@ -0,0 +1,120 @@
+# FINAL PROJECT FLASHCARD APP / core / progress_writer.py
+
+import threading
+from typing import List, Dict, Optional
+
+# How long queued answers wait before the worker thread writes them
+FLUSH_DELAY_SECONDS = 1.5
+
+
+def merge_progress_records(older: Optional[Dict], newer: Dict) -> Dict:
+    """Coalesce two queued records for the same card into one"""
+    if older is None or newer.get('reset'):
+        # A reset wipes out anything queued before it
+        return dict(newer)
+
+    merged = dict(older)
+    merged['add_correct'] = older.get('add_correct', 0) + newer.get('add_correct', 0)
+    merged['add_wrong'] = older.get('add_wrong', 0) + newer.get('add_wrong', 0)
+    if 'learned' in newer:
+        merged['learned'] = newer['learned']
+    if 'schedule' in newer:
+        # The scheduler's latest state already accounts for every earlier answer
+        merged['schedule'] = newer['schedule']
+    return merged
+
+
+class ProgressWriter:
+    """Queues study progress per card and writes it in batches from a worker thread"""
+
+    def __init__(self, username=None, delay=FLUSH_DELAY_SECONDS):
+        self.username = username
+        self.delay = delay
+        self._pending: Dict[tuple, Dict] = {}
+        self._lock = threading.Lock()
+        # Keeps batches in order when a manual flush races the timer
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    def record_answer(self, set_name: str, card_id: str, learned: bool, correct: bool,
+                      schedule: Optional[Dict] = None):
+        """Queue one Correct/Wrong answer (with the card's new review schedule, if any)"""
+        record = {
+            'set': set_name,
+            'card': card_id,
+            'learned': learned,
+            'add_correct': 1 if correct else 0,
+            'add_wrong': 0 if correct else 1
+        }
+        if schedule is not None:
+            record['schedule'] = schedule
+        self._queue(record)
+
+    def discard(self, set_names: Optional[List[str]] = None):
+        """Drop queued updates for the given sets (all sets if None), e.g. before a reset"""
+        with self._lock:
+            if set_names is None:
+                self._pending = {}
+            else:
+                names = set(set_names)
+                self._pending = {key: record for key, record in self._pending.items() if key[0] not in names}
+
+    def has_pending(self) -> bool:
+        with self._lock:
+            return bool(self._pending)
+
+    def _queue(self, record: Dict):
+        key = (record['set'], record['card'])
+        with self._lock:
+            self._pending[key] = merge_progress_records(self._pending.get(key), record)
+
+            # First update since the last flush starts the countdown
+            if self._timer is None:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> bool:
+        """Write everything queued so far in a single storage write"""
+        with self._flush_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                records = list(self._pending.values())
+                self._pending = {}
+
+            if not records:
+                return True
+
+            from .data_manager import DataManager
+            if DataManager(self.username).apply_progress_batch(records):
+                return True
+
+            # Put the batch back (under anything queued meanwhile) so it isn't lost
+            with self._lock:
+                for record in records:
+                    key = (record['set'], record['card'])
+                    newer = self._pending.get(key)
+                    self._pending[key] = merge_progress_records(record, newer) if newer else record
+            return False
+
+
+# One writer per user for the whole process
+_writers: Dict[Optional[str], ProgressWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_progress_writer(username=None) -> ProgressWriter:
+    with _writers_lock:
+        if username not in _writers:
+            _writers[username] = ProgressWriter(username)
+        return _writers[username]
+
+
+def flush_all_writers():
+    """Write out every user's queued progress (called when the app closes)"""
+    with _writers_lock:
+        writers: List[ProgressWriter] = list(_writers.values())
+    for writer in writers:
+        writer.flush()
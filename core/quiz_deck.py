@@ -0,0 +1,81 @@
+# FINAL PROJECT FLASHCARD APP / core / quiz_deck.py
+
+import random
+from collections import deque
+from typing import List, Dict, Optional
+from utils.file_helper import load_app_settings
+
+# Where a card answered with a mistake goes: the back of the deck, or a few cards later
+REQUEUE_POLICIES = ("back", "later")
+DEFAULT_REQUEUE_POLICY = "back"
+DEFAULT_REQUEUE_GAP = 3
+
+
+def get_requeue_policy() -> tuple:
+    """(policy, gap) chosen in app_settings.json ("mc_requeue" and "mc_requeue_gap")"""
+    settings = load_app_settings()
+    policy = settings.get("mc_requeue", DEFAULT_REQUEUE_POLICY)
+    if policy not in REQUEUE_POLICIES:
+        policy = DEFAULT_REQUEUE_POLICY
+    gap = settings.get("mc_requeue_gap", DEFAULT_REQUEUE_GAP)
+    if not isinstance(gap, int) or gap < 1:
+        gap = DEFAULT_REQUEUE_GAP
+    return policy, gap
+
+
+class QuizDeck:
+    """Cards still to be answered in a multiple-choice session
+
+    Holds positions into the set's card list (the cards are not copied), so
+    starting is one shuffle and every step is a constant-time deque operation.
+    """
+
+    def __init__(self, cards: List[Dict], policy=DEFAULT_REQUEUE_POLICY, gap=DEFAULT_REQUEUE_GAP, rng=random):
+        self.cards = cards
+        self.policy = policy
+        self.gap = gap
+        order = list(range(len(cards)))
+        rng.shuffle(order)
+        self.queue = deque(order)
+        self.mastered: List[int] = []  # Positions answered right first time, in order
+
+    def __len__(self):
+        return len(self.queue)
+
+    @property
+    def total(self) -> int:
+        return len(self.cards)
+
+    def current(self) -> Optional[Dict]:
+        return self.cards[self.queue[0]] if self.queue else None
+
+    def advance(self, mastered: bool):
+        """Finish the current card - mastered cards leave the deck, the rest come back"""
+        position = self.queue.popleft()
+        if mastered:
+            self.mastered.append(position)
+        elif self.policy == "later" and self.gap < len(self.queue):
+            # Inserting near the front of a deque only shifts the first few entries
+            self.queue.insert(self.gap, position)
+        else:
+            self.queue.append(position)
+
+    def to_state(self) -> Dict:
+        """Card ids still to go and already mastered - enough to rebuild the deck later"""
+        return {
+            'queue': [self.cards[position]['id'] for position in self.queue],
+            'mastered': [self.cards[position]['id'] for position in self.mastered]
+        }
+
+    @classmethod
+    def from_state(cls, cards: List[Dict], state: Dict, policy=DEFAULT_REQUEUE_POLICY,
+                   gap=DEFAULT_REQUEUE_GAP) -> "QuizDeck":
+        """Rebuild a saved deck - cards deleted since are dropped, cards added since join the queue"""
+        deck = cls([], policy, gap)
+        deck.cards = cards
+        positions = {card['id']: position for position, card in enumerate(cards)}
+        deck.mastered = [positions[card_id] for card_id in state.get('mastered', []) if card_id in positions]
+        deck.queue = deque(positions[card_id] for card_id in state.get('queue', []) if card_id in positions)
+        placed = set(deck.mastered).union(deck.queue)
+        deck.queue.extend(position for position in range(len(cards)) if position not in placed)
+        return deck
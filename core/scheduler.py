@@ -0,0 +1,123 @@
+# FINAL PROJECT FLASHCARD APP / core / scheduler.py
+
+import heapq
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+
+# SM-2 parameters
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+FIRST_INTERVAL_DAYS = 1
+SECOND_INTERVAL_DAYS = 6
+# Correct / Wrong map to these SM-2 answer qualities (0-5)
+QUALITY_CORRECT = 4
+QUALITY_WRONG = 1
+
+DAY_SECONDS = 24 * 60 * 60
+# A missed card comes back this soon, so it is retried in the same session
+RELEARN_SECONDS = 60
+# Cards due within this window may be shown early when nothing else is due
+LEARN_AHEAD_SECONDS = 20 * 60
+# Successful reviews in a row before a card counts as mastered
+LEARNED_REPETITIONS = 2
+
+# Keys the scheduler keeps in a card's progress record
+SCHEDULE_FIELDS = ('ease', 'interval', 'repetitions', 'due')
+
+
+def get_schedule(card: Dict) -> Dict:
+    """A card's scheduling state - never-reviewed cards are due immediately"""
+    progress = card.get('progress') or {}
+    if 'due' not in progress and progress.get('learned'):
+        # Learned before the scheduler existed - pick up as if reviewed twice, due now
+        return {'ease': DEFAULT_EASE, 'interval': SECOND_INTERVAL_DAYS,
+                'repetitions': LEARNED_REPETITIONS, 'due': 0}
+    return {
+        'ease': progress.get('ease', DEFAULT_EASE),
+        'interval': progress.get('interval', 0),
+        'repetitions': progress.get('repetitions', 0),
+        'due': progress.get('due', 0)
+    }
+
+
+def review(schedule: Dict, correct: bool, now: Optional[float] = None) -> Dict:
+    """Next scheduling state after one answer (SM-2)"""
+    now = time.time() if now is None else now
+    quality = QUALITY_CORRECT if correct else QUALITY_WRONG
+    ease = schedule['ease']
+
+    if quality < 3:
+        # Start over: short relearning step, then 1 day, 6 days, ...
+        repetitions = 0
+        interval = 0
+        due = now + RELEARN_SECONDS
+    else:
+        repetitions = schedule['repetitions'] + 1
+        if repetitions == 1:
+            interval = FIRST_INTERVAL_DAYS
+        elif repetitions == 2:
+            interval = SECOND_INTERVAL_DAYS
+        else:
+            interval = round(schedule['interval'] * ease, 2)
+        due = now + interval * DAY_SECONDS
+
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return {'ease': round(ease, 3), 'interval': interval, 'repetitions': repetitions, 'due': round(due)}
+
+
+def is_learned(schedule: Dict) -> bool:
+    return schedule['repetitions'] >= LEARNED_REPETITIONS
+
+
+def end_of_day(now: Optional[float] = None) -> float:
+    """Timestamp of the coming local midnight - cards due before it are due today"""
+    today = datetime.fromtimestamp(time.time() if now is None else now).date()
+    return datetime.combine(today + timedelta(days=1), datetime.min.time()).timestamp()
+
+
+class DueQueue:
+    """Min-heap of cards by due time - the next card to study comes out in O(log n)
+
+    Cards due at the same time (e.g. new cards) keep their order in the set,
+    or in order (a list of positions into cards) when one is given.
+    With review_until set, every card due before then is shown without waiting.
+    """
+
+    def __init__(self, cards: List[Dict], review_until: Optional[float] = None, order: Optional[List[int]] = None):
+        self.review_until = review_until
+        if order is None:
+            order = range(len(cards))
+        self._heap = [(get_schedule(cards[position])['due'], rank, cards[position]['id'])
+                      for rank, position in enumerate(order)]
+        heapq.heapify(self._heap)
+        self._positions = {card_id: rank for _, rank, card_id in self._heap}
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, card_id: str, due: float):
+        """Put a just-reviewed card back with its new due time"""
+        heapq.heappush(self._heap, (due, self._positions.get(card_id, len(self._positions)), card_id))
+
+    def take(self, card_id: str) -> bool:
+        """Take a particular card out of the queue (e.g. to resume on it) - O(n), once per session"""
+        for i, entry in enumerate(self._heap):
+            if entry[2] == card_id:
+                self._heap[i] = self._heap[-1]
+                self._heap.pop()
+                heapq.heapify(self._heap)
+                return True
+        return False
+
+    def next_due(self) -> Optional[float]:
+        """When the earliest card is due (None if the queue is empty)"""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> Optional[str]:
+        """Take the card that most needs review - None if nothing is due yet"""
+        now = time.time() if now is None else now
+        horizon = max(now + LEARN_AHEAD_SECONDS, self.review_until or 0)
+        if not self._heap or self._heap[0][0] > horizon:
+            return None
+        return heapq.heappop(self._heap)[2]
@@ -0,0 +1,263 @@
+# FINAL PROJECT FLASHCARD APP / core / search_index.py
+
+import bisect
+import math
+import os
+import re
+from collections import Counter
+from typing import List, Dict, Optional
+from .per_set_index import PerSetIndex
+
+TOKEN_RE = re.compile(r"\w+")
+
+# How much a word counts depending on where it appears
+SET_NAME_WEIGHT = 3
+FIELD_WEIGHTS = {'question': 2, 'answer': 2, 'custom_hint': 1}
+# A word that only starts with the query term scores less than an exact match
+PREFIX_FACTOR = 0.5
+# Shorter terms only match whole words (a 1-2 letter prefix matches most of the vocabulary)
+MIN_PREFIX_LENGTH = 3
+# Fuzzy mode: words sharing enough trigrams with a term count as (weaker) matches
+FUZZY_MIN_SIMILARITY = 0.35
+FUZZY_FACTOR = 0.4
+
+# The document that holds a set's name (cards use their own id)
+SET_NAME_DOC = ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded words of a text"""
+    return TOKEN_RE.findall(text.casefold())
+
+
+def trigrams(word: str) -> set:
+    """Three-letter slices of a word, padded so its start and end count too"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex(PerSetIndex):
+    """Inverted index over set names and card questions, answers and hints
+
+    postings maps word -> {set id: {card id: weight}}, so a whole set can be
+    dropped or re-indexed without touching any other set (or its file).
+    """
+
+    def __init__(self, directory=None):
+        super().__init__(directory)
+        self.postings: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self.set_tokens: Dict[str, set] = {}  # Words each set contributes
+        self.doc_counts: Dict[str, int] = {}  # Documents (name + cards) per set
+        self._sorted_tokens = None
+        self._doc_freqs = {}
+        self._trigram_index = None  # Trigram -> words, built on the first fuzzy search
+
+    def _add_doc(self, set_id, doc_id, weights: Counter):
+        for token, weight in weights.items():
+            if token not in self.postings:
+                self.postings[token] = {}
+                self._index_trigrams(token)
+            self.postings[token].setdefault(set_id, {})[doc_id] = weight
+            self.set_tokens[set_id].add(token)
+
+    def remove_set(self, set_id):
+        with self.lock:
+            for token in self.set_tokens.pop(set_id, ()):
+                docs = self.postings.get(token)
+                if docs is not None:
+                    docs.pop(set_id, None)
+                    if not docs:
+                        del self.postings[token]
+                        self._unindex_trigrams(token)
+                        self._sorted_tokens = None
+            self.doc_counts.pop(set_id, None)
+            self._doc_freqs = {}
+
+    def update_set(self, set_data: Dict):
+        """(Re-)index one set - only that set's postings change"""
+        set_id = set_data['set_id']
+        with self.lock:
+            self.remove_set(set_id)
+            self.set_tokens[set_id] = set()
+
+            weights = Counter()
+            for token in tokenize(set_data['set_name']):
+                weights[token] += SET_NAME_WEIGHT
+            self._add_doc(set_id, SET_NAME_DOC, weights)
+
+            for card in set_data['cards']:
+                weights = Counter()
+                for field, field_weight in FIELD_WEIGHTS.items():
+                    for token in tokenize(card.get(field) or ""):
+                        weights[token] += field_weight
+                self._add_doc(set_id, card['id'], weights)
+
+            self.doc_counts[set_id] = len(set_data['cards']) + 1
+            self._sorted_tokens = None
+            self._doc_freqs = {}
+
+    def rebuild(self, all_sets: List[Dict]):
+        with self.lock:
+            self.postings, self.set_tokens, self.doc_counts = {}, {}, {}
+            self._trigram_index = None
+            for set_data in all_sets:
+                self.update_set(set_data)
+
+    def set_ids(self) -> set:
+        return set(self.set_tokens)
+
+    def _expand(self, term) -> List[str]:
+        """Every indexed word that starts with term (term itself first if indexed)"""
+        if len(term) < MIN_PREFIX_LENGTH:
+            return [term] if term in self.postings else []
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.postings)
+        tokens = self._sorted_tokens
+        start = bisect.bisect_left(tokens, term)
+        end = bisect.bisect_left(tokens, term + "\U0010ffff")
+        return tokens[start:end]
+
+    def _index_trigrams(self, token):
+        # Kept up to date once built, so fuzzy search never rescans the vocabulary
+        if self._trigram_index is not None:
+            for gram in trigrams(token):
+                self._trigram_index.setdefault(gram, set()).add(token)
+
+    def _unindex_trigrams(self, token):
+        if self._trigram_index is not None:
+            for gram in trigrams(token):
+                words = self._trigram_index.get(gram)
+                if words is not None:
+                    words.discard(token)
+                    if not words:
+                        del self._trigram_index[gram]
+
+    def prepare_fuzzy(self):
+        """Build the trigram index now (e.g. on a worker thread) instead of on the first fuzzy search"""
+        with self.lock:
+            if self._trigram_index is None:
+                self._trigram_index = {}
+                for token in self.postings:
+                    self._index_trigrams(token)
+
+    def _fuzzy_expand(self, term) -> Dict[str, float]:
+        """Indexed words similar to term (trigram Jaccard similarity) -> similarity"""
+        self.prepare_fuzzy()
+
+        term_grams = trigrams(term)
+        shared = Counter()
+        for gram in term_grams:
+            shared.update(self._trigram_index.get(gram, ()))
+
+        similar = {}
+        for token, count in shared.items():
+            # A padded word of n letters has at most n + 1 trigrams
+            similarity = count / (len(term_grams) + len(token) + 1 - count)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                similar[token] = similarity
+        return similar
+
+    def _term_postings(self, term, fuzzy=False) -> List[tuple]:
+        """(set id -> {doc id: weight}, multiplier) for every word the term matches"""
+        total_docs = sum(self.doc_counts.values()) or 1
+        factors = {token: 1.0 if token == term else PREFIX_FACTOR for token in self._expand(term)}
+        if fuzzy:
+            for token, similarity in self._fuzzy_expand(term).items():
+                factors.setdefault(token, FUZZY_FACTOR * similarity)
+
+        postings = []
+        for token, factor in factors.items():
+            docs_by_set = self.postings[token]
+            doc_freq = self._doc_freqs.get(token)
+            if doc_freq is None:
+                doc_freq = self._doc_freqs[token] = sum(map(len, docs_by_set.values()))
+            postings.append((docs_by_set, math.log(1 + total_docs / doc_freq) * factor))
+        return postings
+
+    def _matching_sets(self, per_term) -> set:
+        # Sets that contain every term somewhere - cheap, no document is visited
+        matching = None
+        for postings in sorted(per_term, key=len):
+            term_sets = set().union(*(docs_by_set.keys() for docs_by_set, _ in postings))
+            matching = term_sets if matching is None else matching & term_sets
+            if not matching:
+                break
+        return matching or set()
+
+    def search(self, query: str, limit: Optional[int] = 50, fuzzy=False) -> List[Dict]:
+        """Documents containing every query word (or a word starting with it), best first
+
+        With fuzzy=True misspelled words also match similar indexed words.
+        Each hit is {'set_id', 'card_id' (None for a set-name hit), 'score'}.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        scores = {}
+        with self.lock:
+            per_term = [self._term_postings(term, fuzzy) for term in terms]
+            # Only documents of sets that contain every term can match
+            for set_id in self._matching_sets(per_term):
+                set_scores = None
+                for postings in per_term:
+                    term_scores = {}
+                    for docs_by_set, multiplier in postings:
+                        for doc_id, weight in docs_by_set.get(set_id, {}).items():
+                            term_scores[doc_id] = max(term_scores.get(doc_id, 0.0), weight * multiplier)
+                    if set_scores is None:
+                        set_scores = term_scores
+                    else:
+                        set_scores = {doc_id: score + term_scores[doc_id]
+                                      for doc_id, score in set_scores.items() if doc_id in term_scores}
+                    if not set_scores:
+                        break
+                for doc_id, score in (set_scores or {}).items():
+                    scores[(set_id, doc_id)] = score
+
+        hits = sorted(scores.items(), key=lambda item: -item[1])
+        if limit is not None:
+            hits = hits[:limit]
+        return [{'set_id': set_id, 'card_id': doc_id or None, 'score': score}
+                for (set_id, doc_id), score in hits]
+
+    def search_sets(self, query: str, fuzzy=False) -> Dict[str, float]:
+        """Set id -> score for sets whose name and cards contain every query word between them
+
+        Scored from each word's best document in the set, so no card is visited.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return {}
+
+        with self.lock:
+            per_term = [self._term_postings(term, fuzzy) for term in terms]
+            scores = {}
+            for set_id in self._matching_sets(per_term):
+                total = 0.0
+                for postings in per_term:
+                    total += max(max(docs_by_set[set_id].values()) * multiplier
+                                 for docs_by_set, multiplier in postings if set_id in docs_by_set)
+                scores[set_id] = total
+            return scores
+
+    def encode_set(self, set_id) -> Dict:
+        docs = {}
+        for token in self.set_tokens[set_id]:
+            for doc_id, weight in self.postings[token][set_id].items():
+                docs.setdefault(doc_id, {})[token] = weight
+        return {'doc_count': self.doc_counts[set_id], 'docs': docs}
+
+    def decode_sets(self, payloads: Dict[str, Dict]):
+        postings, set_tokens, doc_counts = {}, {}, {}
+        for set_id, data in payloads.items():
+            set_tokens[set_id] = set()
+            doc_counts[set_id] = data['doc_count']
+            for doc_id, weights in data['docs'].items():
+                for token, weight in weights.items():
+                    postings.setdefault(token, {}).setdefault(set_id, {})[doc_id] = weight
+                    set_tokens[set_id].add(token)
+        self.postings, self.set_tokens, self.doc_counts = postings, set_tokens, doc_counts
+        self._sorted_tokens = None
+        self._doc_freqs = {}
+        self._trigram_index = None
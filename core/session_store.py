@@ -0,0 +1,105 @@
+# FINAL PROJECT FLASHCARD APP / core / session_store.py
+
+import os
+import threading
+import time
+from typing import List, Dict, Optional
+from utils.file_helper import atomic_write_json, read_json_with_backup
+
+# How long checkpoints wait before the worker thread writes them
+CHECKPOINT_DELAY_SECONDS = 2.0
+# Sessions untouched for this long are dropped instead of resumed
+SESSION_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+
+def session_key(mode: str, set_data: Dict) -> str:
+    """Key of a set's session in one study mode ("flip" or "mc")"""
+    return f"{mode}:{set_data.get('set_id') or set_data['set_name']}"
+
+
+class SessionStore:
+    """Where each set's study session left off, so it can be picked up again
+
+    Sessions hold card ids and counters only (never card copies). Checkpoints
+    are coalesced and written a moment later from a worker thread.
+    """
+
+    def __init__(self, path, delay=CHECKPOINT_DELAY_SECONDS):
+        self.path = path
+        self.delay = delay
+        self._sessions: Optional[Dict[str, Dict]] = None  # Read on first use
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._sessions is None:
+            try:
+                data = read_json_with_backup(self.path, default={})
+            except ValueError:
+                data = {}
+            cutoff = time.time() - SESSION_MAX_AGE_SECONDS
+            self._sessions = {key: state for key, state in data.get('sessions', {}).items()
+                              if state.get('saved', 0) >= cutoff}
+        return self._sessions
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            state = self._load().get(key)
+            return dict(state) if state is not None else None
+
+    def checkpoint(self, key: str, state: Dict):
+        """Remember a session's state - written shortly after, together with other checkpoints"""
+        with self._lock:
+            self._load()[key] = dict(state, saved=time.time())
+            self._schedule()
+
+    def clear(self, key: str):
+        """Forget a finished session"""
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._schedule()
+
+    def _schedule(self):
+        self._dirty = True
+        if self._timer is None:
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """Write the checkpoints now (e.g. when leaving a study page or closing the app)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return True
+            try:
+                atomic_write_json(self.path, {'sessions': self._sessions}, "compact", ensure_ascii=False)
+                self._dirty = False
+                return True
+            except Exception as e:
+                print(f"Error saving study session: {e}")
+                return False
+
+
+# One store per user for the whole process
+_stores: Dict[Optional[str], SessionStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_session_store(username=None, data_dir="data") -> SessionStore:
+    with _stores_lock:
+        if username not in _stores:
+            file_name = f"study_sessions_{username}.json" if username else "study_sessions.json"
+            _stores[username] = SessionStore(os.path.join(data_dir, file_name))
+        return _stores[username]
+
+
+def flush_all_session_stores():
+    """Write every user's pending checkpoints (called when the app closes)"""
+    with _stores_lock:
+        stores: List[SessionStore] = list(_stores.values())
+    for store in stores:
+        store.flush()
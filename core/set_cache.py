@@ -0,0 +1,77 @@
+# FINAL PROJECT FLASHCARD APP / core / set_cache.py
+
+import os
+import threading
+from typing import List, Dict, Optional
+from .journal import build_card_index
+
+
+def file_stamp(*paths) -> tuple:
+    """(mtime, size) for each path - changes whenever a file is edited from outside"""
+    stamp = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stamp.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def clone(value):
+    """Copy JSON-shaped data so callers can't mutate what the cache holds"""
+    if isinstance(value, dict):
+        return {key: clone(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [clone(item) for item in value]
+    return value
+
+
+class SetCache:
+    """Parsed sets for one data file, shared by every DataManager in the process"""
+
+    def __init__(self):
+        self.sets: Optional[List[Dict]] = None
+        self.stamp = None
+        self._card_index = None
+        # Held around every read-modify-write of the file (the progress writer runs on its own thread)
+        self.lock = threading.RLock()
+
+    def get(self, stamp) -> Optional[List[Dict]]:
+        # Only serve the cached sets while the files on disk still match them
+        if self.sets is not None and self.stamp == stamp:
+            return self.sets
+        return None
+
+    def store(self, sets: List[Dict], stamp):
+        self.sets = sets
+        self.stamp = stamp
+        self._card_index = None
+
+    def touch(self, stamp):
+        """Record that the cached sets were updated in place to match the files"""
+        self.stamp = stamp
+
+    def card_index(self) -> Dict[str, tuple]:
+        """Set name -> (set, {card id: card}) for the cached sets, built on first use"""
+        if self._card_index is None:
+            self._card_index = build_card_index(self.sets)
+        return self._card_index
+
+    def invalidate(self):
+        self.sets = None
+        self.stamp = None
+        self._card_index = None
+
+
+# One cache per data file for the whole process
+_caches: Dict[str, SetCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_set_cache(path) -> SetCache:
+    key = os.path.abspath(path)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = SetCache()
+        return _caches[key]
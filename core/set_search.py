@@ -0,0 +1,133 @@
+# FINAL PROJECT FLASHCARD APP / core / set_search.py
+
+import threading
+from typing import List, Dict, Callable, Optional
+from .search_index import SearchIndex, MIN_PREFIX_LENGTH, tokenize
+
+# Ranking of a match, best first
+NAME_PREFIX, NAME_CONTAINS, CONTENT = 0, 1, 2
+
+
+def normalize_query(query: str) -> str:
+    """Case-folded query with whitespace collapsed"""
+    return " ".join(query.casefold().split())
+
+
+class SetSearch:
+    """Searches set names and card text for the set list, a slice at a time
+
+    A set matches if its name contains every word of the query, or if the
+    full-text index finds the query in its name or one of its cards. When the
+    query is only extended (more letters or more words) and every word is long
+    enough to be matched as a prefix, the new search scans just the previous
+    matches instead of the whole library. Fuzzy searches also accept
+    misspelled words, ranked below exact matches.
+    """
+
+    def __init__(self, summaries: List[Dict], index_loader: Optional[Callable[[], SearchIndex]] = None,
+                 on_index_ready: Optional[Callable[[], None]] = None):
+        self.summaries = summaries
+        self.names = [summary['set_name'].casefold() for summary in summaries]
+        self.index_loader = index_loader
+        # Called from the loader thread once searches can run (the page queues it onto the GUI thread)
+        self.on_index_ready = on_index_ready
+        self._index = None if index_loader else SearchIndex()
+        self._loading = False
+        self._last = None  # (query, fuzzy, matching indices) of the last finished search
+
+    @property
+    def index_ready(self) -> bool:
+        return self._index is not None
+
+    def load_index_async(self):
+        """Load the full-text index on a worker thread so the first search never blocks typing"""
+        if self.index_ready or self._loading:
+            return
+        self._loading = True
+
+        def load():
+            try:
+                index = self.index_loader()
+                # Fuzzy mode's trigram table is built here too, off the GUI thread
+                index.prepare_fuzzy()
+                self._index = index
+            except Exception as e:
+                print(f"Search index error: {e}")
+                self._index = SearchIndex()
+            if self.on_index_ready is not None:
+                self.on_index_ready()
+
+        threading.Thread(target=load, daemon=True).start()
+
+    def start(self, query: str, fuzzy=False) -> "SearchJob":
+        query = normalize_query(query)
+        candidates = None
+        if (not fuzzy and self._last is not None and not self._last[1]
+                and query.startswith(self._last[0])
+                and all(len(term) >= MIN_PREFIX_LENGTH for term in tokenize(self._last[0]) + tokenize(query))):
+            # A longer query can only match a subset of what the shorter one did
+            # (not so for fuzzy matching, where a longer word can be closer to more words,
+            # nor for short terms, which the index matches as whole words but not as prefixes)
+            candidates = self._last[2]
+        return SearchJob(self, query, candidates, fuzzy)
+
+    def _finished(self, query, fuzzy, matches):
+        self._last = (query, fuzzy, matches)
+
+
+class SearchJob:
+    """One query being run in slices - call step() until it returns True"""
+
+    def __init__(self, search: SetSearch, query: str, candidates: Optional[List[int]], fuzzy=False):
+        self.search = search
+        self.query = query
+        self.fuzzy = fuzzy
+        self.words = query.split()
+        self.candidates = candidates if candidates is not None else range(len(search.summaries))
+        self.position = 0
+        self.matches = []  # (index, rank, score) in library order
+        self.content_scores = None  # Set id -> full-text score
+        self.done = not self.words
+
+    def _rank(self, i) -> Optional[tuple]:
+        name = self.search.names[i]
+        if name.startswith(self.query):
+            return NAME_PREFIX, 0.0
+        if all(word in name for word in self.words):
+            return NAME_CONTAINS, 0.0
+        score = self.content_scores.get(self.search.summaries[i].get('set_id'))
+        if score is not None:
+            return CONTENT, score
+        return None
+
+    def step(self, max_sets=500) -> bool:
+        """Check up to max_sets more sets - returns True once the search is complete"""
+        if self.done:
+            return True
+        if not self.search.index_ready:
+            # The index is still loading in the background
+            self.search.load_index_async()
+            return False
+        if self.content_scores is None:
+            # One index lookup covers every set's cards
+            self.content_scores = self.search._index.search_sets(self.query, self.fuzzy)
+            return False
+
+        end = min(self.position + max_sets, len(self.candidates))
+        for i in self.candidates[self.position:end]:
+            rank = self._rank(i)
+            if rank is not None:
+                self.matches.append((i, *rank))
+        self.position = end
+
+        if self.position >= len(self.candidates):
+            self.done = True
+            self.search._finished(self.query, self.fuzzy, [i for i, _, _ in self.matches])
+        return self.done
+
+    def results(self) -> Optional[List[int]]:
+        """Matching set indices, best matches first (None means no query - show everything)"""
+        if not self.words:
+            return None
+        # Name matches first, then content matches by relevance
+        return [i for i, _, _ in sorted(self.matches, key=lambda match: (match[1], -match[2]))]
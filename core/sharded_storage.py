@@ -0,0 +1,292 @@
+# FINAL PROJECT FLASHCARD APP / core / sharded_storage.py
+
+import os
+import shutil
+from typing import List, Dict, Optional
+from .storage import JsonStorage, summarize_set
+from .journal import apply_progress_record, build_card_index
+from .flashcard_model import new_id, assign_missing_ids
+from .set_cache import get_set_cache, file_stamp, clone
+from utils.file_helper import get_storage_format, atomic_write_json, read_json_with_backup
+
+MANIFEST_VERSION = 1
+
+
+class ShardedStorage:
+    """One file per set plus a small manifest, so a change only rewrites the set it touches
+
+    Layout: data/flashcard_sets_<username>/manifest.json lists the sets in order
+    (with their summaries) and sets/<set_id>.json holds each set's cards and progress.
+    """
+
+    def __init__(self, data_dir, username=None, storage_format=None):
+        self.data_dir = data_dir
+        self.username = username
+        self.storage_format = storage_format or get_storage_format()
+        self.root = self._get_user_library_dir()
+        self.sets_dir = os.path.join(self.root, "sets")
+        self.manifest_file = os.path.join(self.root, "manifest.json")
+        # Held for anything that changes which sets exist; progress only locks its set's file
+        self.manifest = get_set_cache(self.manifest_file)
+        os.makedirs(self.sets_dir, exist_ok=True)
+
+        with self.manifest.lock:
+            if not self._has_manifest():
+                if self._set_file_names():
+                    # Set files without a manifest - list what is on disk rather than import over it
+                    self._recover_manifest()
+                else:
+                    # One-shot import of the single-file library (left in place untouched)
+                    migrate_single_file_library(JsonStorage(data_dir, username, self.storage_format), self)
+
+    def _get_user_library_dir(self):
+        """Get the library directory for the current user"""
+        if self.username:
+            return os.path.join(self.data_dir, f"flashcard_sets_{self.username}")
+        else:
+            return os.path.join(self.data_dir, "flashcard_sets")
+
+    def _set_file(self, set_id) -> str:
+        return os.path.join(self.sets_dir, f"{set_id}.json")
+
+    def _has_manifest(self) -> bool:
+        # The backup counts too - reading falls back to it
+        return os.path.exists(self.manifest_file) or os.path.exists(self.manifest_file + ".bak")
+
+    def _set_file_names(self) -> List[str]:
+        return [name for name in os.listdir(self.sets_dir) if name.endswith(".json")]
+
+    def _recover_manifest(self):
+        """Rebuild the manifest from the set files (oldest set first)"""
+        all_sets = []
+        for file_name in self._set_file_names():
+            try:
+                set_data = read_json_with_backup(os.path.join(self.sets_dir, file_name))
+            except ValueError as e:
+                print(f"Skipping damaged set file: {e}")
+                continue
+            if set_data is not None:
+                all_sets.append(set_data)
+        all_sets.sort(key=lambda set_data: (set_data.get('created_date') or "", set_data['set_name']))
+        print(f"⚠️ {self.manifest_file} was missing - rebuilt it from {len(all_sets)} set file(s)")
+        self._save_manifest([summarize_set(set_data) for set_data in all_sets])
+
+    def import_sets(self, all_sets: List[Dict]):
+        """Fill an empty library (used by the migration) - never touches existing set files
+
+        The set files are written to a staging directory that replaces the empty
+        sets/ in one rename, and the manifest is written last, so an interrupted
+        import either runs again from scratch or is found complete.
+        """
+        with self.manifest.lock:
+            if self._has_manifest() or self._set_file_names():
+                raise ValueError(f"{self.root} already holds a library")
+            if all_sets:
+                staging_dir = self.sets_dir + ".importing"
+                if os.path.exists(staging_dir):
+                    shutil.rmtree(staging_dir)
+                os.makedirs(staging_dir)
+                taken = set()
+                for set_data in all_sets:
+                    self._claim_set_id(set_data, taken)
+                    taken.add(set_data['set_id'])
+                    atomic_write_json(os.path.join(staging_dir, f"{set_data['set_id']}.json"), set_data,
+                                      self.storage_format, ensure_ascii=False)
+                # sets/ holds no set file (checked above), at most temp files left by a crash
+                shutil.rmtree(self.sets_dir)
+                os.rename(staging_dir, self.sets_dir)
+            self._save_manifest([summarize_set(set_data) for set_data in all_sets])
+
+    def _entries(self) -> List[Dict]:
+        """Manifest entries (set summaries, in library order) - re-read only if the file changed"""
+        with self.manifest.lock:
+            stamp = file_stamp(self.manifest_file)
+            entries = self.manifest.get(stamp)
+            if entries is None:
+                entries = read_json_with_backup(self.manifest_file, default={'sets': []})['sets']
+                self.manifest.store(entries, stamp)
+            return entries
+
+    def _save_manifest(self, entries: List[Dict]):
+        atomic_write_json(self.manifest_file, {'version': MANIFEST_VERSION, 'sets': entries},
+                          "compact", ensure_ascii=False, backup=True)
+        self.manifest.store(entries, file_stamp(self.manifest_file))
+
+    def _find_entry(self, set_name) -> Optional[int]:
+        # Names aren't unique in the single-file format either - the first set wins
+        for i, entry in enumerate(self._entries()):
+            if entry['set_name'] == set_name:
+                return i
+        return None
+
+    def _read_set(self, set_id) -> Optional[Dict]:
+        """Cached parsed set file (callers must not mutate it)"""
+        path = self._set_file(set_id)
+        cache = get_set_cache(path)
+        with cache.lock:
+            stamp = file_stamp(path)
+            set_data = cache.get(stamp)
+            if set_data is None:
+                set_data = read_json_with_backup(path)
+                if set_data is None:
+                    return None
+                cache.store(set_data, stamp)
+            return set_data
+
+    def _write_set(self, set_data: Dict):
+        path = self._set_file(set_data['set_id'])
+        cache = get_set_cache(path)
+        with cache.lock:
+            atomic_write_json(path, set_data, self.storage_format, ensure_ascii=False, backup=True)
+            cache.store(clone(set_data), file_stamp(path))
+
+    def _remove_set_file(self, set_id):
+        path = self._set_file(set_id)
+        cache = get_set_cache(path)
+        with cache.lock:
+            for leftover in (path, path + ".bak"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            cache.invalidate()
+
+    def _claim_set_id(self, set_data: Dict, taken):
+        # Copied sets can share an id - every set needs its own file
+        assign_missing_ids(set_data)
+        if set_data['set_id'] in taken:
+            set_data['set_id'] = new_id()
+
+    def load_all_sets(self) -> List[Dict]:
+        all_sets = []
+        for entry in self._entries():
+            set_data = self._read_set(entry['set_id'])
+            if set_data is not None:
+                all_sets.append(clone(set_data))
+        return all_sets
+
+    def load_set_summaries(self) -> List[Dict]:
+        """The manifest already holds every set's summary - no set file is opened"""
+        return clone(self._entries())
+
+    def save_all_sets(self, all_sets: List[Dict]):
+        """Replace the whole library - raises on failure"""
+        with self.manifest.lock:
+            old_ids = {entry['set_id'] for entry in self._entries()}
+
+            taken = set()
+            for set_data in all_sets:
+                self._claim_set_id(set_data, taken)
+                taken.add(set_data['set_id'])
+                self._write_set(set_data)
+            self._save_manifest([summarize_set(set_data) for set_data in all_sets])
+
+            # Sets that are no longer listed
+            for set_id in old_ids - taken:
+                self._remove_set_file(set_id)
+
+    def get_set(self, set_name: str) -> Optional[Dict]:
+        with self.manifest.lock:
+            i = self._find_entry(set_name)
+            if i is None:
+                return None
+            set_id = self._entries()[i]['set_id']
+        set_data = self._read_set(set_id)
+        return clone(set_data) if set_data is not None else None
+
+    def add_set(self, set_data: Dict):
+        with self.manifest.lock:
+            entries = self._entries()
+            self._claim_set_id(set_data, {entry['set_id'] for entry in entries})
+            self._write_set(set_data)
+            self._save_manifest(entries + [summarize_set(set_data)])
+
+    def replace_set(self, set_name: str, set_data: Dict) -> bool:
+        """Swap a set for its edited version in place - only its file and the manifest are written"""
+        with self.manifest.lock:
+            i = self._find_entry(set_name)
+            if i is None:
+                return False
+            entries = list(self._entries())
+            old_id = entries[i]['set_id']
+
+            self._claim_set_id(set_data, {entry['set_id'] for j, entry in enumerate(entries) if j != i})
+            self._write_set(set_data)
+            entries[i] = summarize_set(set_data)
+            self._save_manifest(entries)
+
+            if set_data['set_id'] != old_id:
+                self._remove_set_file(old_id)
+            return True
+
+    def delete_set(self, set_name: str) -> bool:
+        with self.manifest.lock:
+            i = self._find_entry(set_name)
+            if i is None:
+                return False
+            entries = list(self._entries())
+            removed = entries.pop(i)
+            # Manifest first - a crash in between only leaves an unlisted file behind
+            self._save_manifest(entries)
+            self._remove_set_file(removed['set_id'])
+            return True
+
+    def update_progress(self, set_name: str, card_id: str, learned: bool, correct: bool) -> bool:
+        return self.apply_progress_batch([{
+            'set': set_name,
+            'card': card_id,
+            'learned': learned,
+            'add_correct': 1 if correct else 0,
+            'add_wrong': 0 if correct else 1
+        }])
+
+    def apply_progress_batch(self, records: List[Dict]) -> bool:
+        """Apply progress records, rewriting only the files of the sets they touch
+
+        Records for sets/cards that no longer exist are skipped.
+        """
+        records_by_set = {}
+        for record in records:
+            records_by_set.setdefault(record.get('set'), []).append(record)
+
+        # Resolve names once; the manifest isn't held while set files are written
+        with self.manifest.lock:
+            set_ids = {}
+            for set_name in records_by_set:
+                i = self._find_entry(set_name)
+                if i is not None:
+                    set_ids[set_name] = self._entries()[i]['set_id']
+
+        for set_name, set_id in set_ids.items():
+            cache = get_set_cache(self._set_file(set_id))
+            with cache.lock:
+                set_data = self._read_set(set_id)
+                if set_data is None:
+                    # Deleted since the names were resolved
+                    continue
+                set_data = clone(set_data)
+                card_index = build_card_index([set_data])
+                applied = [apply_progress_record(card_index, record) for record in records_by_set[set_name]]
+                if any(applied):
+                    self._write_set(set_data)
+        return True
+
+    def reset_progress(self, set_names: Optional[List[str]] = None) -> bool:
+        """Clear progress for the given sets (every set if None), one write per set"""
+        if set_names is None:
+            set_names = [entry['set_name'] for entry in self._entries()]
+        if not set_names:
+            return True
+        return self.apply_progress_batch([{'set': name, 'reset': True} for name in set_names])
+
+    def compact(self):
+        # Progress is written straight into each set's file - nothing to fold in
+        pass
+
+
+def migrate_single_file_library(json_storage: JsonStorage, sharded_storage: ShardedStorage) -> int:
+    """Split a user's single-file library (including journaled progress) into per-set files
+
+    Only runs on an empty library; see ShardedStorage.import_sets.
+    """
+    all_sets = json_storage.read_library()
+    sharded_storage.import_sets(all_sets)
+    return len(all_sets)
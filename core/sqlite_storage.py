@@ -0,0 +1,411 @@
+# FINAL PROJECT FLASHCARD APP / core / sqlite_storage.py
+
+import glob
+import os
+import sqlite3
+from typing import List, Dict, Optional
+from .storage import JsonStorage
+from .flashcard_model import new_id, assign_missing_ids
+from utils.file_helper import get_fsync_policy
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sets (
+    id INTEGER PRIMARY KEY,
+    set_name TEXT NOT NULL,
+    difficulty TEXT,
+    created_date TEXT,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sets_name ON sets(set_name);
+
+CREATE TABLE IF NOT EXISTS cards (
+    id INTEGER PRIMARY KEY,
+    set_id INTEGER NOT NULL REFERENCES sets(id),
+    position INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    custom_hint TEXT,
+    learned INTEGER,
+    times_correct INTEGER NOT NULL DEFAULT 0,
+    times_wrong INTEGER NOT NULL DEFAULT 0
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_cards_set_position ON cards(set_id, position);
+"""
+
+# Schema upgrades, applied in order and tracked with PRAGMA user_version
+MIGRATIONS = [
+    SCHEMA,
+    # 1: stable set and card ids
+    """
+    ALTER TABLE sets ADD COLUMN set_uid TEXT;
+    ALTER TABLE cards ADD COLUMN card_uid TEXT;
+    CREATE INDEX IF NOT EXISTS idx_cards_uid ON cards(set_id, card_uid);
+    """,
+    # 2: review schedule (NULL until the card has been reviewed)
+    """
+    ALTER TABLE cards ADD COLUMN ease REAL;
+    ALTER TABLE cards ADD COLUMN interval_days REAL;
+    ALTER TABLE cards ADD COLUMN repetitions INTEGER;
+    ALTER TABLE cards ADD COLUMN due REAL;
+    """,
+]
+
+
+def _backfill_ids(conn):
+    # Rows written before ids existed
+    for (row_id,) in conn.execute("SELECT id FROM sets WHERE set_uid IS NULL").fetchall():
+        conn.execute("UPDATE sets SET set_uid = ? WHERE id = ?", (new_id(), row_id))
+    for (row_id,) in conn.execute("SELECT id FROM cards WHERE card_uid IS NULL").fetchall():
+        conn.execute("UPDATE cards SET card_uid = ? WHERE id = ?", (new_id(), row_id))
+
+
+# Migration step -> data fix that goes with it
+MIGRATION_BACKFILLS = {1: _backfill_ids}
+
+CARD_COLUMNS = ("card_uid, question, answer, custom_hint, learned, times_correct, times_wrong, "
+                "ease, interval_days, repetitions, due")
+# Clears a card's progress and schedule
+RESET_COLUMNS = ("learned = NULL, times_correct = 0, times_wrong = 0, "
+                 "ease = NULL, interval_days = NULL, repetitions = NULL, due = NULL")
+
+# fsync policy -> PRAGMA synchronous (in WAL mode NORMAL only syncs at checkpoints)
+SYNCHRONOUS_LEVELS = {"always": "FULL", "batched": "NORMAL", "never": "OFF"}
+
+
+class SqliteStorage:
+    """Sets, cards and progress as indexed rows in a per-user SQLite database"""
+
+    def __init__(self, data_dir, username=None):
+        self.data_dir = data_dir
+        self.username = username
+        self.db_file = self._get_user_db_file()
+        self.synchronous = SYNCHRONOUS_LEVELS[get_fsync_policy()]
+
+        first_open = not os.path.exists(self.db_file)
+        self._create_schema()
+
+        # One-shot import of the user's existing JSON library
+        if first_open:
+            try:
+                migrate_json_to_sqlite(JsonStorage(data_dir, username), self)
+            except Exception:
+                # Leave no half-filled database behind so the next open retries
+                os.remove(self.db_file)
+                raise
+
+    def _get_user_db_file(self):
+        """Get the database path for the current user"""
+        if self.username:
+            return os.path.join(self.data_dir, f"flashcard_sets_{self.username}.db")
+        else:
+            return os.path.join(self.data_dir, "flashcard_sets.db")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file)
+        # SQLite commits atomically on its own; the fsync policy only sets how often it syncs
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        try:
+            # WAL keeps readers from blocking single-row progress writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            for step in range(version, len(MIGRATIONS)):
+                conn.executescript(MIGRATIONS[step])
+                # Data fixes commit together with the version bump, so they run exactly once
+                with conn:
+                    if step in MIGRATION_BACKFILLS:
+                        MIGRATION_BACKFILLS[step](conn)
+                    conn.execute(f"PRAGMA user_version = {step + 1}")
+        finally:
+            conn.close()
+
+    def _find_set_id(self, conn, set_name) -> Optional[int]:
+        # Names aren't unique in the JSON format either - the first set wins
+        row = conn.execute(
+            "SELECT id FROM sets WHERE set_name = ? ORDER BY position LIMIT 1",
+            (set_name,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _card_to_dict(self, row) -> Dict:
+        (card_uid, question, answer, custom_hint, learned, times_correct, times_wrong,
+         ease, interval_days, repetitions, due) = row
+        card = {'id': card_uid, 'question': question, 'answer': answer}
+        if custom_hint:
+            card['custom_hint'] = custom_hint
+        # learned is NULL until the card has been studied at least once
+        if learned is not None:
+            card['progress'] = {
+                'learned': bool(learned),
+                'times_correct': times_correct,
+                'times_wrong': times_wrong
+            }
+            if due is not None:
+                card['progress'].update({'ease': ease, 'interval': interval_days,
+                                         'repetitions': repetitions, 'due': due})
+        return card
+
+    def _insert_set(self, conn, set_data: Dict, position: int):
+        assign_missing_ids(set_data)
+        cursor = conn.execute(
+            "INSERT INTO sets (set_uid, set_name, difficulty, created_date, position) VALUES (?, ?, ?, ?, ?)",
+            (set_data['set_id'], set_data['set_name'], set_data.get('difficulty'),
+             set_data.get('created_date'), position)
+        )
+        self._insert_cards(conn, cursor.lastrowid, set_data['cards'])
+
+    def _insert_cards(self, conn, set_id, cards: List[Dict]):
+        rows = []
+        for card_position, card in enumerate(cards):
+            progress = card.get('progress')
+            rows.append((
+                set_id, card['id'], card_position, card['question'], card['answer'], card.get('custom_hint'),
+                int(progress['learned']) if progress else None,
+                progress['times_correct'] if progress else 0,
+                progress['times_wrong'] if progress else 0,
+                *(progress.get(field) if progress else None for field in ('ease', 'interval', 'repetitions', 'due'))
+            ))
+        conn.executemany(
+            "INSERT INTO cards (set_id, card_uid, position, question, answer, custom_hint, "
+            "learned, times_correct, times_wrong, ease, interval_days, repetitions, due) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+
+    def _load_cards(self, conn, set_id) -> List[Dict]:
+        rows = conn.execute(
+            f"SELECT {CARD_COLUMNS} FROM cards WHERE set_id = ? ORDER BY position",
+            (set_id,)
+        )
+        return [self._card_to_dict(row) for row in rows]
+
+    def _set_to_dict(self, conn, row) -> Dict:
+        set_id, set_uid, set_name, difficulty, created_date = row
+        set_data = {'set_id': set_uid, 'set_name': set_name, 'created_date': created_date, 'cards': []}
+        if difficulty is not None:
+            set_data['difficulty'] = difficulty
+        set_data['cards'] = self._load_cards(conn, set_id)
+        return set_data
+
+    def load_all_sets(self) -> List[Dict]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, set_uid, set_name, difficulty, created_date FROM sets ORDER BY position"
+            ).fetchall()
+            return [self._set_to_dict(conn, row) for row in rows]
+        finally:
+            conn.close()
+
+    def save_all_sets(self, all_sets: List[Dict]):
+        """Replace the whole library - raises on failure"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM cards")
+                conn.execute("DELETE FROM sets")
+                for position, set_data in enumerate(all_sets):
+                    self._insert_set(conn, set_data, position)
+        finally:
+            conn.close()
+
+    def load_set_summaries(self) -> List[Dict]:
+        """Name, difficulty, date and counts for every set, computed without loading cards"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT s.set_uid, s.set_name, s.difficulty, s.created_date, "
+                "COUNT(c.id), COUNT(DISTINCT c.answer) "
+                "FROM sets s LEFT JOIN cards c ON c.set_id = s.id "
+                "GROUP BY s.id ORDER BY s.position"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        summaries = []
+        for set_uid, set_name, difficulty, created_date, card_count, answer_count in rows:
+            summary = {'set_id': set_uid, 'set_name': set_name, 'created_date': created_date,
+                       'card_count': card_count, 'answer_count': answer_count}
+            if difficulty is not None:
+                summary['difficulty'] = difficulty
+            summaries.append(summary)
+        return summaries
+
+    def get_set(self, set_name: str) -> Optional[Dict]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, set_uid, set_name, difficulty, created_date FROM sets "
+                "WHERE set_name = ? ORDER BY position LIMIT 1",
+                (set_name,)
+            ).fetchone()
+            return self._set_to_dict(conn, row) if row else None
+        finally:
+            conn.close()
+
+    def add_set(self, set_data: Dict):
+        conn = self._connect()
+        try:
+            with conn:
+                position = conn.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM sets").fetchone()[0]
+                self._insert_set(conn, set_data, position)
+        finally:
+            conn.close()
+
+    def replace_set(self, set_name: str, set_data: Dict) -> bool:
+        """Swap a set for its edited version in one transaction, keeping its row and position"""
+        assign_missing_ids(set_data)
+        conn = self._connect()
+        try:
+            with conn:
+                set_id = self._find_set_id(conn, set_name)
+                if set_id is None:
+                    return False
+                conn.execute(
+                    "UPDATE sets SET set_uid = ?, set_name = ?, difficulty = ?, created_date = ? WHERE id = ?",
+                    (set_data['set_id'], set_data['set_name'], set_data.get('difficulty'),
+                     set_data.get('created_date'), set_id)
+                )
+                conn.execute("DELETE FROM cards WHERE set_id = ?", (set_id,))
+                self._insert_cards(conn, set_id, set_data['cards'])
+                return True
+        finally:
+            conn.close()
+
+    def delete_set(self, set_name: str) -> bool:
+        conn = self._connect()
+        try:
+            with conn:
+                set_id = self._find_set_id(conn, set_name)
+                if set_id is None:
+                    return False
+                conn.execute("DELETE FROM cards WHERE set_id = ?", (set_id,))
+                conn.execute("DELETE FROM sets WHERE id = ?", (set_id,))
+                return True
+        finally:
+            conn.close()
+
+    def update_progress(self, set_name: str, card_id: str, learned: bool, correct: bool) -> bool:
+        return self.apply_progress_batch([{
+            'set': set_name,
+            'card': card_id,
+            'learned': learned,
+            'add_correct': 1 if correct else 0,
+            'add_wrong': 0 if correct else 1
+        }])
+
+    def apply_progress_batch(self, records: List[Dict]) -> bool:
+        """Apply progress records (same shape as journal records) in one transaction
+
+        Records for sets/cards that no longer exist are skipped.
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                set_ids = {}
+                for record in records:
+                    set_name = record['set']
+                    if set_name not in set_ids:
+                        set_ids[set_name] = self._find_set_id(conn, set_name)
+                    set_id = set_ids[set_name]
+                    if set_id is None:
+                        continue
+
+                    if 'card' not in record:
+                        # Whole-set reset
+                        if record.get('reset'):
+                            self._reset_set_rows(conn, set_id)
+                        continue
+
+                    # Cards are addressed by id (older callers used the position)
+                    key_column = "position" if isinstance(record['card'], int) else "card_uid"
+
+                    if record.get('reset'):
+                        conn.execute(
+                            f"UPDATE cards SET {RESET_COLUMNS} WHERE set_id = ? AND {key_column} = ?",
+                            (set_id, record['card'])
+                        )
+                        if not ('learned' in record or 'schedule' in record
+                                or record.get('add_correct') or record.get('add_wrong')):
+                            continue
+
+                    learned = record.get('learned')
+                    conn.execute(
+                        "UPDATE cards SET learned = COALESCE(?, learned, 0), "
+                        "times_correct = times_correct + ?, times_wrong = times_wrong + ? "
+                        f"WHERE set_id = ? AND {key_column} = ?",
+                        (None if learned is None else int(learned),
+                         record.get('add_correct', 0), record.get('add_wrong', 0),
+                         set_id, record['card'])
+                    )
+
+                    schedule = record.get('schedule')
+                    if schedule is not None:
+                        conn.execute(
+                            "UPDATE cards SET ease = ?, interval_days = ?, repetitions = ?, due = ? "
+                            f"WHERE set_id = ? AND {key_column} = ?",
+                            (schedule['ease'], schedule['interval'], schedule['repetitions'], schedule['due'],
+                             set_id, record['card'])
+                        )
+            return True
+        finally:
+            conn.close()
+
+    def _reset_set_rows(self, conn, set_id) -> int:
+        cursor = conn.execute(
+            f"UPDATE cards SET {RESET_COLUMNS} WHERE set_id = ?",
+            (set_id,)
+        )
+        return cursor.rowcount
+
+    def reset_progress(self, set_names: Optional[List[str]] = None) -> bool:
+        """Clear progress for the given sets (every set if None) in one statement per set"""
+        conn = self._connect()
+        try:
+            with conn:
+                if set_names is None:
+                    conn.execute(f"UPDATE cards SET {RESET_COLUMNS}")
+                    return True
+                for set_name in set_names:
+                    set_id = self._find_set_id(conn, set_name)
+                    if set_id is not None:
+                        self._reset_set_rows(conn, set_id)
+                return True
+        finally:
+            conn.close()
+
+    def compact(self):
+        # Every write already lands in its own rows - nothing to fold in
+        pass
+
+
+def migrate_json_to_sqlite(json_storage: JsonStorage, sqlite_storage: SqliteStorage) -> int:
+    """Copy a user's JSON library (including journaled progress) into SQLite - returns set count"""
+    all_sets = json_storage.read_library()
+    if all_sets:
+        sqlite_storage.save_all_sets(all_sets)
+    return len(all_sets)
+
+
+def migrate_all_json_libraries(data_dir="data") -> Dict[str, int]:
+    """Migrate every data/flashcard_sets_*.json file that has no database yet"""
+    migrated = {}
+    for json_file in glob.glob(os.path.join(data_dir, "flashcard_sets_*.json")):
+        if json_file.endswith(".meta.json"):
+            # Summary sidecar, not a library
+            continue
+        username = os.path.basename(json_file)[len("flashcard_sets_"):-len(".json")]
+        if os.path.exists(os.path.join(data_dir, f"flashcard_sets_{username}.db")):
+            continue
+        # Opening the store for the first time runs the migration
+        storage = SqliteStorage(data_dir, username)
+        migrated[username] = len(storage.load_all_sets())
+    return migrated
+
+
+if __name__ == "__main__":
+    for name, count in migrate_all_json_libraries().items():
+        print(f"Migrated {count} set(s) for {name}")
@@ -0,0 +1,249 @@
+# FINAL PROJECT FLASHCARD APP / core / storage.py
+
+import os
+from typing import List, Dict, Optional
+from .journal import ProgressJournal, apply_progress_record, build_card_index
+from .flashcard_model import assign_missing_ids
+from .set_cache import get_set_cache, file_stamp, clone
+from utils.file_helper import load_app_settings, get_storage_format, atomic_write_json, read_json_with_backup
+
+# Fold the progress journal back into the snapshot once it grows past this size
+JOURNAL_COMPACT_BYTES = 64 * 1024
+
+DEFAULT_BACKEND = "json"
+
+
+def summarize_set(set_data: Dict) -> Dict:
+    """What the All Cards grid shows for a set, without its cards"""
+    summary = {
+        'set_id': set_data.get('set_id'),
+        'set_name': set_data['set_name'],
+        'created_date': set_data.get('created_date'),
+        'card_count': len(set_data['cards']),
+        # Multiple choice needs at least 4 distinct answers
+        'answer_count': len({card['answer'] for card in set_data['cards']})
+    }
+    if 'difficulty' in set_data:
+        summary['difficulty'] = set_data['difficulty']
+    return summary
+
+
+def get_storage_backend(data_dir, username, backend_name=None, storage_format=None):
+    """Create the storage backend chosen for this install ("json", "sharded" or "sqlite")
+
+    storage_format ("indent", "compact" or "gzip") applies to the JSON file backends.
+    """
+    if backend_name is None:
+        backend_name = load_app_settings().get("storage_backend", DEFAULT_BACKEND)
+
+    if backend_name == "sqlite":
+        # Imported here so the JSON-only path never touches sqlite3
+        from .sqlite_storage import SqliteStorage
+        return SqliteStorage(data_dir, username)
+    if backend_name == "sharded":
+        from .sharded_storage import ShardedStorage
+        return ShardedStorage(data_dir, username, storage_format)
+    return JsonStorage(data_dir, username, storage_format)
+
+
+class JsonStorage:
+    """All of a user's sets in one JSON file, with study progress journaled beside it"""
+
+    def __init__(self, data_dir, username=None, storage_format=None):
+        self.data_dir = data_dir
+        self.username = username
+        # Format used for writes; reads detect whatever is on disk
+        self.storage_format = storage_format or get_storage_format()
+        self.data_file = self._get_user_data_file()
+        self.journal = ProgressJournal(os.path.splitext(self.data_file)[0] + ".journal")
+        # Per-set summaries so the set list can be shown without parsing every card
+        self.meta_file = os.path.splitext(self.data_file)[0] + ".meta.json"
+        # Parsed sets shared with every other DataManager for this user
+        self.cache = get_set_cache(self.data_file)
+
+    def _get_user_data_file(self):
+        """Get the flashcard file path for the current user"""
+        if self.username:
+            return os.path.join(self.data_dir, f"flashcard_sets_{self.username}.json")
+        else:
+            # Fallback to shared file if no username
+            return os.path.join(self.data_dir, "flashcard_sets.json")
+
+    def _stamp(self):
+        return file_stamp(self.data_file, self.journal.path)
+
+    def _cached_sets(self) -> List[Dict]:
+        """Shared parsed sets - re-read only if the files changed since last time"""
+        with self.cache.lock:
+            stamp = self._stamp()
+            all_sets = self.cache.get(stamp)
+            if all_sets is None:
+                all_sets, ids_added = self._read_library()
+
+                # Files saved before cards had ids get them once, then keep them
+                if ids_added:
+                    self.save_all_sets(all_sets)
+                    all_sets = self.cache.sets
+                else:
+                    self.cache.store(all_sets, stamp)
+            return all_sets
+
+    def _read_library(self) -> tuple:
+        """(sets with pending progress replayed, whether any set or card was given an id)"""
+        all_sets = self._load_snapshot()
+
+        # Replay progress events that haven't been compacted yet
+        card_index = build_card_index(all_sets)
+        for record in self.journal.read_pending_records(self.data_file):
+            apply_progress_record(card_index, record)
+
+        ids_added = [assign_missing_ids(flashcard_set) for flashcard_set in all_sets]
+        return all_sets, any(ids_added)
+
+    def read_library(self) -> List[Dict]:
+        """Every set with its journaled progress, without writing anything back (for migrations)"""
+        with self.cache.lock:
+            return self._read_library()[0]
+
+    def load_all_sets(self) -> List[Dict]:
+        with self.cache.lock:
+            return clone(self._cached_sets())
+
+    def _load_snapshot(self) -> List[Dict]:
+        # Empty list if there is no file yet; a damaged file falls back to its
+        # .bak and raises if that is unreadable too, so it never gets overwritten
+        return read_json_with_backup(self.data_file, default=[])
+
+    def save_all_sets(self, all_sets: List[Dict]):
+        """Write every set to the JSON file - raises on failure"""
+        with self.cache.lock:
+            # Set the journal aside first: if we crash before clearing it, the next
+            # load can tell whether the snapshot below already contains its records
+            self.journal.rotate(self.data_file)
+
+            # Temp file + rename, keeping the previous version as .bak
+            atomic_write_json(self.data_file, all_sets, self.storage_format, ensure_ascii=False, backup=True)
+
+            # The snapshot now contains every journaled event
+            self.journal.clear()
+            self._save_summaries(all_sets)
+
+            # Write-through: keep our own copy so later reads skip the parser
+            self.cache.store(clone(all_sets), self._stamp())
+
+    def _save_summaries(self, all_sets: List[Dict]):
+        # Stamped with the snapshot it describes so a stale sidecar is never trusted
+        atomic_write_json(self.meta_file, {
+            'stamp': file_stamp(self.data_file)[0],
+            'sets': [summarize_set(flashcard_set) for flashcard_set in all_sets]
+        }, "compact", ensure_ascii=False)
+
+    def _read_summaries(self) -> Optional[List[Dict]]:
+        try:
+            meta = read_json_with_backup(self.meta_file)
+        except ValueError:
+            return None
+        if not meta or meta.get('stamp') != list(file_stamp(self.data_file)[0] or []):
+            return None
+        return meta['sets']
+
+    def load_set_summaries(self) -> List[Dict]:
+        """Name, difficulty, date and counts for every set - parses no cards if the sidecar is current"""
+        with self.cache.lock:
+            cached_sets = self.cache.get(self._stamp())
+            if cached_sets is not None:
+                return [summarize_set(flashcard_set) for flashcard_set in cached_sets]
+
+            # Progress never changes the summaries, so only the snapshot has to match
+            summaries = self._read_summaries()
+            if summaries is not None:
+                return summaries
+
+            # Missing or stale (e.g. the file was edited by hand) - parse once and rebuild it
+            all_sets = self._cached_sets()
+            if all_sets:
+                self._save_summaries(all_sets)
+            return [summarize_set(flashcard_set) for flashcard_set in all_sets]
+
+    def get_set(self, set_name: str) -> Optional[Dict]:
+        with self.cache.lock:
+            for flashcard_set in self._cached_sets():
+                if flashcard_set['set_name'] == set_name:
+                    return clone(flashcard_set)
+            return None
+
+    def add_set(self, set_data: Dict):
+        assign_missing_ids(set_data)
+        with self.cache.lock:
+            all_sets = self.load_all_sets()
+            all_sets.append(set_data)
+            self.save_all_sets(all_sets)
+
+    def replace_set(self, set_name: str, set_data: Dict) -> bool:
+        """Swap a set for its edited version in place (same position, one write)"""
+        assign_missing_ids(set_data)
+        with self.cache.lock:
+            all_sets = self.load_all_sets()
+            for i, flashcard_set in enumerate(all_sets):
+                if flashcard_set['set_name'] == set_name:
+                    all_sets[i] = set_data
+                    self.save_all_sets(all_sets)
+                    return True
+            return False
+
+    def delete_set(self, set_name: str) -> bool:
+        with self.cache.lock:
+            all_sets = self.load_all_sets()
+
+            # Find and remove the set
+            for i, flashcard_set in enumerate(all_sets):
+                if flashcard_set['set_name'] == set_name:
+                    all_sets.pop(i)
+                    self.save_all_sets(all_sets)
+                    return True
+            return False
+
+    def update_progress(self, set_name: str, card_id: str, learned: bool, correct: bool) -> bool:
+        return self.apply_progress_batch([{
+            'set': set_name,
+            'card': card_id,
+            'learned': learned,
+            'add_correct': 1 if correct else 0,
+            'add_wrong': 0 if correct else 1
+        }])
+
+    def apply_progress_batch(self, records: List[Dict]) -> bool:
+        """Append progress records in one write instead of rewriting the whole file
+
+        Records for sets/cards that no longer exist are skipped when replayed.
+        """
+        with self.cache.lock:
+            cached_sets = self.cache.get(self._stamp())
+            self.journal.append_many(records)
+
+            # Apply the same records to the cache so it stays in step with the files
+            if cached_sets is not None:
+                card_index = self.cache.card_index()
+                for record in records:
+                    apply_progress_record(card_index, record)
+                self.cache.touch(self._stamp())
+
+            # Keep the journal short so loading stays fast
+            if self.journal.size() >= JOURNAL_COMPACT_BYTES:
+                self.compact()
+            return True
+
+    def reset_progress(self, set_names: Optional[List[str]] = None) -> bool:
+        """Clear progress for the given sets (every set if None) with one journal append"""
+        with self.cache.lock:
+            if set_names is None:
+                set_names = [flashcard_set['set_name'] for flashcard_set in self._cached_sets()]
+            if not set_names:
+                return True
+            return self.apply_progress_batch([{'set': name, 'reset': True} for name in set_names])
+
+    def compact(self):
+        """Fold pending progress events into the snapshot and clear the journal"""
+        with self.cache.lock:
+            if self.journal.size() > 0 or self.journal.has_rotated():
+                self.save_all_sets(self._cached_sets())
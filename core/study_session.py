@@ -0,0 +1,68 @@
+# FINAL PROJECT FLASHCARD APP / core / study_session.py
+
+from typing import List, Dict
+from .scheduler import get_schedule, is_learned
+
+# Where a card stands in a study session
+NEW, LEARNING, MASTERED = "new", "learning", "mastered"
+BUCKETS = (NEW, LEARNING, MASTERED)
+
+
+def card_bucket(card: Dict) -> str:
+    """new (never answered), mastered (see scheduler.is_learned) or learning"""
+    progress = card.get('progress')
+    if not progress or not (progress.get('times_correct') or progress.get('times_wrong') or 'due' in progress):
+        return NEW
+    return MASTERED if is_learned(get_schedule(card)) else LEARNING
+
+
+class SessionStats:
+    """Mastered / learning / new counts for a study session, kept up to date answer by answer
+
+    The cards are looked at once when the session starts; after that each answer
+    only moves one card between buckets, overall and for its difficulty.
+    """
+
+    def __init__(self, cards: List[Dict], default_difficulty='Easy'):
+        self.total = len(cards)
+        self.counts = dict.fromkeys(BUCKETS, 0)
+        self.by_difficulty: Dict[str, Dict[str, int]] = {}
+        self._buckets = {}  # Card id -> bucket
+        self._difficulties = {}  # Card id -> difficulty
+        self.default_difficulty = default_difficulty
+
+        for card in cards:
+            bucket = card_bucket(card)
+            difficulty = card.get('difficulty') or default_difficulty
+            self._buckets[card['id']] = bucket
+            self._difficulties[card['id']] = difficulty
+            self.counts[bucket] += 1
+            self.by_difficulty.setdefault(difficulty, dict.fromkeys(BUCKETS, 0))[bucket] += 1
+
+    def update(self, card: Dict):
+        """Re-bucket one card after its progress changed"""
+        card_id = card['id']
+        old = self._buckets.get(card_id)
+        new = card_bucket(card)
+        if old == new:
+            return
+        difficulty = self._difficulties.get(card_id, self.default_difficulty)
+        difficulty_counts = self.by_difficulty.setdefault(difficulty, dict.fromkeys(BUCKETS, 0))
+        if old is not None:
+            self.counts[old] -= 1
+            difficulty_counts[old] -= 1
+        self.counts[new] += 1
+        difficulty_counts[new] += 1
+        self._buckets[card_id] = new
+
+    def count(self, bucket: str) -> int:
+        return self.counts[bucket]
+
+    def percent(self, bucket: str) -> float:
+        return self.counts[bucket] / self.total * 100 if self.total else 0.0
+
+    def difficulty_percent(self, difficulty: str, bucket: str) -> float:
+        counts = self.by_difficulty.get(difficulty)
+        if not counts:
+            return 0.0
+        return counts[bucket] / sum(counts.values()) * 100
@@ -1,5 +1,5 @@
 # data/user_and_theme.py
-import json, os
+from utils.file_helper import atomic_write_json, read_json_with_backup
 
 class AppData:
     def __init__(self):
@@ -11,9 +11,8 @@ class AppData:
 
     def load_data(self):
         """Load saved user data and profiles from disk."""
-        if os.path.exists("user_profiles.json"):
-            with open("user_profiles.json", "r") as f:
-                data = json.load(f)
+        data = read_json_with_backup("user_profiles.json")
+        if data is not None:
             self.profile_data = data
             self.accounts = list(data.keys())
 
@@ -21,8 +20,7 @@ class AppData:
         """Save or update a user profile."""
         self.profile_data[username] = info
         self.accounts = list(self.profile_data.keys())
-        with open("user_profiles.json", "w") as f:
-            json.dump(self.profile_data, f, indent=4)
+        atomic_write_json("user_profiles.json", self.profile_data, backup=True)
 
     def get_profile(self, username):
         """Get a user's profile info."""
@@ -33,5 +31,4 @@ class AppData:
         if username in self.profile_data:
             del self.profile_data[username]
             self.accounts = list(self.profile_data.keys())
-            with open("user_profiles.json", "w") as f:
-                json.dump(self.profile_data, f, indent=4)
\ No newline at end of file
+            atomic_write_json("user_profiles.json", self.profile_data, backup=True)
\ No newline at end of file
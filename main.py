@@ -67,6 +67,15 @@ def main():
     
     stacked_app = AppStack()
     
+    # Write any study progress and session checkpoints still queued before the app exits
+    from core.progress_writer import flush_all_writers
+    from core.session_store import flush_all_session_stores
+    from utils.file_helper import flush_pending_fsyncs
+    app.aboutToQuit.connect(flush_all_writers)
+    app.aboutToQuit.connect(flush_all_session_stores)
+    # Last, so the writes above are synced too under the batched fsync policy
+    app.aboutToQuit.connect(flush_pending_fsyncs)
+    
     def on_bootup_complete():
         bootup_page.close()
         stacked_app.showMaximized()
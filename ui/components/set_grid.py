@@ -0,0 +1,216 @@
+# FINAL PROJECT FLASHCARD APP / ui / components / set_grid.py
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QRectF, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPainterPath
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from ui.visual.styles.styles import get_set_card_palette
+
+# Height of one set card including its outer margin
+CARD_HEIGHT = 230
+CARDS_PER_ROW = 2
+
+
+class SetListModel(QAbstractListModel):
+    """Set summaries for the All Cards grid - filtering only swaps which rows are visible"""
+
+    SummaryRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._sets = []
+        self._rows = []  # Indices into _sets that pass the current filter
+
+    def set_sets(self, sets):
+        """Replace every set (e.g. after loading or refreshing)"""
+        self.beginResetModel()
+        self._sets = list(sets)
+        self._rows = list(range(len(self._sets)))
+        self.endResetModel()
+
+    def set_rows(self, rows):
+        """Show only these indices into the loaded sets, in this order"""
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def all_sets(self):
+        return self._sets
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._rows):
+            return None
+        summary = self._sets[self._rows[index.row()]]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return summary['set_name']
+        if role == SetListModel.SummaryRole:
+            return summary
+        return None
+
+
+class SetCardDelegate(QStyledItemDelegate):
+    """Paints a set card (name, difficulty, counts, Study/Delete buttons) - no widgets per set"""
+
+    study_clicked = pyqtSignal(dict)
+    delete_clicked = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.palette = get_set_card_palette()
+        self.cell_size = QSize(320, CARD_HEIGHT)
+        self._hover = None  # (row, "study" / "delete") under the mouse
+
+    def sizeHint(self, option, index):
+        return self.cell_size
+
+    def _card_rect(self, rect) -> QRect:
+        # Same outer margin as the old card frames (8px 5px)
+        return rect.adjusted(5, 8, -5, -8)
+
+    def _button_rects(self, rect):
+        card = self._card_rect(rect).adjusted(15, 15, -15, -15)
+        width = (card.width() - 10) // 2
+        top = card.bottom() - 40
+        study = QRect(card.left(), top, width, 40)
+        delete = QRect(card.left() + width + 10, top, width, 40)
+        return study, delete
+
+    def _font(self, base, pixel_size, weight):
+        font = QFont(base)
+        font.setPixelSize(pixel_size)
+        font.setWeight(weight)
+        return font
+
+    def _draw_button(self, painter, rect, text, color):
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(rect), 12, 12)
+        painter.fillPath(path, QColor(color))
+        painter.setPen(QColor(self.palette["button_text"]))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+
+    def paint(self, painter, option, index):
+        summary = index.data(SetListModel.SummaryRole)
+        if summary is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # Cycle through 4 colors per row, like the old grid
+        backgrounds = self.palette["backgrounds"]
+        color = backgrounds[(index.row() // CARDS_PER_ROW) % len(backgrounds)]
+        card = self._card_rect(option.rect)
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(card), 15, 15)
+        painter.fillPath(path, QColor(color))
+
+        inner = card.adjusted(18, 18, -18, -18)
+        y = inner.top()
+
+        # Set name
+        name_font = self._font(option.font, 16, QFont.Weight.Bold)
+        painter.setFont(name_font)
+        painter.setPen(QColor(self.palette["name"]))
+        metrics = QFontMetrics(name_font)
+        name = metrics.elidedText(summary['set_name'], Qt.TextElideMode.ElideRight, inner.width())
+        painter.drawText(QRect(inner.left(), y, inner.width(), metrics.height()), Qt.AlignmentFlag.AlignLeft, name)
+        y += metrics.height() + 10
+
+        # Difficulty level text below set name
+        difficulty_font = self._font(option.font, 13, QFont.Weight.Medium)
+        painter.setFont(difficulty_font)
+        painter.setPen(QColor(self.palette["difficulty"]))
+        metrics = QFontMetrics(difficulty_font)
+        painter.drawText(QRect(inner.left(), y, inner.width(), metrics.height()), Qt.AlignmentFlag.AlignLeft,
+                         f"Difficulty level: {summary.get('difficulty', 'Easy')}")
+        y += metrics.height() + 10
+
+        # Set info
+        info_font = self._font(option.font, 14, QFont.Weight.Normal)
+        painter.setFont(info_font)
+        painter.setPen(QColor(self.palette["info"]))
+        metrics = QFontMetrics(info_font)
+        info_text = f"Cards: {summary['card_count']}\nCreated: {summary['created_date']}"
+        painter.drawText(QRect(inner.left(), y, inner.width(), metrics.lineSpacing() * 2), Qt.AlignmentFlag.AlignLeft, info_text)
+
+        # Buttons
+        painter.setFont(self._font(option.font, 14, QFont.Weight.Bold))
+        study_rect, delete_rect = self._button_rects(option.rect)
+        hovered = self._hover[1] if self._hover and self._hover[0] == index.row() else None
+        self._draw_button(painter, study_rect, "Study",
+                          self.palette["study_button_hover" if hovered == "study" else "study_button"])
+        self._draw_button(painter, delete_rect, "Delete",
+                          self.palette["delete_button_hover" if hovered == "delete" else "delete_button"])
+
+        painter.restore()
+
+    def _button_at(self, rect, pos):
+        study_rect, delete_rect = self._button_rects(rect)
+        if study_rect.contains(pos):
+            return "study"
+        if delete_rect.contains(pos):
+            return "delete"
+        return None
+
+    def clear_hover(self):
+        if self._hover is not None:
+            self._hover = None
+            self.parent().viewport().update()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseMove:
+            button = self._button_at(option.rect, event.position().toPoint())
+            hover = (index.row(), button) if button else None
+            if hover != self._hover:
+                self._hover = hover
+                self.parent().viewport().update()
+            return False
+
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            button = self._button_at(option.rect, event.position().toPoint())
+            summary = index.data(SetListModel.SummaryRole)
+            if button == "study":
+                self.study_clicked.emit(summary)
+                return True
+            if button == "delete":
+                self.delete_clicked.emit(summary)
+                return True
+        return False
+
+
+class SetGridView(QListView):
+    """Two-column grid of set cards - only the rows in view are ever painted"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.ViewMode.ListMode)
+        self.setFlow(QListView.Flow.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(True)
+        # Lay out big libraries in chunks so the page appears immediately
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(200)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setMouseTracking(True)
+
+        self.delegate = SetCardDelegate(self)
+        self.setItemDelegate(self.delegate)
+
+    def resizeEvent(self, event):
+        # Two cards per row whatever the width
+        width = max(200, self.viewport().width() // CARDS_PER_ROW)
+        cell_size = QSize(width, CARD_HEIGHT)
+        if cell_size != self.delegate.cell_size:
+            self.delegate.cell_size = cell_size
+            self.setGridSize(cell_size)
+        super().resizeEvent(event)
+
+    def leaveEvent(self, event):
+        self.delegate.clear_hover()
+        super().leaveEvent(event)
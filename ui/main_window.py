@@ -383,17 +383,13 @@ class MainWindow(QWidget):
             self.flashcard_study_page.current_card_index = 0
             self.flashcard_study_page.is_flipped = False
             
-            # Reset shuffle state and original order for new set
-            import copy
-            self.flashcard_study_page.original_card_order = copy.deepcopy(flashcard_set['cards'])
-            self.flashcard_study_page.is_shuffled = False
-            self.flashcard_study_page.shuffle_btn.setText("🔀 Shuffle")
-            self.flashcard_study_page.shuffle_btn.setStyleSheet(self.flashcard_study_page.styles["shuffle_button"])
+            # Reset shuffle state for new set
+            self.flashcard_study_page.clear_shuffle()
             
             # UPDATE THE SET NAME LABEL
             self.flashcard_study_page.set_name_label.setText(flashcard_set['set_name'])
             
-            self.flashcard_study_page.load_card(0)
+            self.flashcard_study_page.resume_session()
             
             self.show_page(7)
                 
@@ -418,7 +414,7 @@ class MainWindow(QWidget):
         # Show the Pomodoro timer settings dialog
         self.pomodoro_timer.show_settings(self)
 
-    def show_multiple_choice_study(self, flashcard_set):
+    def show_multiple_choice_study(self, flashcard_set, borrowed_answers=()):
         # Show multiple choice study interface
         try:
             # Close sidebar INSTANTLY before page change
@@ -429,7 +425,7 @@ class MainWindow(QWidget):
                 self.sidebar_collapsed = True
             
             # Update the existing multiple choice page with the flashcard set
-            self.multiple_choice_study_page.update_flashcard_set(flashcard_set)
+            self.multiple_choice_study_page.update_flashcard_set(flashcard_set, borrowed_answers)
             
             # Show the multiple choice page
             self.pages_stack.setCurrentIndex(8)
@@ -467,6 +463,10 @@ class MainWindow(QWidget):
         # Use AppData instead of raw file access
         self.data.username = username
         self.current_username = username  # Store current username for flashcard storage
+        
+        # Replay any study progress still sitting in the journal from last session
+        from core.controller import FlashcardController
+        FlashcardController(username).recover_pending_progress()
         profile = self.data.get_profile(username)
         full_name = profile.get("full_name", username)
 
@@ -1,22 +1,32 @@
 # FINAL PROJECT FLASHCARD APP / ui / pages / all_cards_page.py
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, 
-                            QPushButton, QMessageBox, QFrame, QScrollArea, QGridLayout, 
-                            QDialog, QApplication, QLineEdit)
-from PyQt6.QtCore import Qt, QSize
+                            QPushButton, QMessageBox, QDialog, QApplication, QLineEdit, QCheckBox)
+from PyQt6.QtCore import Qt, QSize, QTimer, pyqtSignal
 from PyQt6.QtGui import QPixmap, QIcon
 from ui.visual.styles.styles import get_all_cards_styles, get_inline_label_styles, get_combo_box_styles
 from ui.pages.flashcard_study_multiple_choice_page import MultipleChoiceStudy
+from ui.components.set_grid import SetListModel, SetGridView
 from utils.path_helper import get_asset_path
 
+# Pause in typing before a search starts, and sets checked per event-loop turn
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_SLICE_SETS = 200
+
 class AllCards(QWidget):
+    # Emitted from the search index loader thread - delivered on the GUI thread
+    search_index_ready = pyqtSignal()
+    
     def __init__(self, main_window):
         super().__init__()
         self.main_window = main_window
         self.styles = get_all_cards_styles()
         self.label_styles = get_inline_label_styles()
         self.combo_styles = get_combo_box_styles()
-        self.all_sets = []  # Store all sets for filtering
+        self.all_sets = []  # Store set summaries (no cards) for filtering
+        self.set_search = None  # Name + card text search over all_sets
+        self.search_job = None
+        self.search_results = None  # Indices into all_sets, best first (None = no search)
         self.setup_ui()  # Setup UI first
         self.load_flashcards()  # Then load data
     
@@ -51,16 +61,43 @@ class AllCards(QWidget):
 
         top_controls_layout.addWidget(self.refresh_btn)
         
+        # Study every card due today, whatever set it is in
+        top_controls_layout.addSpacing(10)
+        self.review_due_btn = QPushButton("Review Due")
+        self.review_due_btn.setStyleSheet(self.styles["review_due_button"])
+        self.review_due_btn.clicked.connect(self.start_due_review)
+        top_controls_layout.addWidget(self.review_due_btn)
+        
         # Small space between buttons
         top_controls_layout.addSpacing(10)
         
         # SEARCH BAR right after refresh button
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Search flashcard sets...")
+        self.search_input.setPlaceholderText("Search sets, questions and answers...")
         self.search_input.setStyleSheet(self.styles["search_input"])
-        self.search_input.textChanged.connect(self.filter_sets)
+        self.search_input.textChanged.connect(self.schedule_search)
+        
+        # Wait for a pause in typing before searching
+        self.search_debounce = QTimer(self)
+        self.search_debounce.setSingleShot(True)
+        self.search_debounce.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_debounce.timeout.connect(self.run_search)
+        
+        # Runs a search a slice at a time between key presses
+        self.search_step_timer = QTimer(self)
+        self.search_step_timer.setInterval(0)
+        self.search_step_timer.timeout.connect(self.continue_search)
+        # A search waiting on the full-text index picks up again once it is loaded
+        self.search_index_ready.connect(self.resume_search)
         top_controls_layout.addWidget(self.search_input)
         
+        # Fuzzy mode also finds misspelled set names and card words
+        self.fuzzy_check = QCheckBox("Typo-tolerant")
+        self.fuzzy_check.setStyleSheet(self.styles["fuzzy_checkbox"])
+        self.fuzzy_check.toggled.connect(self.run_search)
+        top_controls_layout.addSpacing(10)
+        top_controls_layout.addWidget(self.fuzzy_check)
+        
         # Small space
         top_controls_layout.addSpacing(10)
         
@@ -89,108 +126,139 @@ class AllCards(QWidget):
         self.no_results_label.hide()
         layout.addWidget(self.no_results_label)
         
-        # Scroll area for flashcard sets
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
-        
-        # Container for flashcard set cards
-        self.sets_container = QWidget()
-        self.sets_layout = QGridLayout(self.sets_container)
-        self.sets_layout.setSpacing(15)
-        self.sets_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.sets_layout.setContentsMargins(0, 0, 100, 20)  # Right margin for scrollbar
-        
-        self.scroll_area.setWidget(self.sets_container)
-        layout.addWidget(self.scroll_area)
+        # Grid of sets - a model/view, so only the cards in view are ever painted
+        self.sets_model = SetListModel(self)
+        self.sets_view = SetGridView()
+        self.sets_view.setModel(self.sets_model)
+        self.sets_view.setStyleSheet(self.styles["sets_view"])
+        self.sets_view.delegate.study_clicked.connect(self.study_set)
+        self.sets_view.delegate.delete_clicked.connect(lambda summary: self.delete_set(summary['set_name']))
+        layout.addWidget(self.sets_view)
+        
+        # Shown instead of the grid when there are no sets yet
+        self.no_sets_container = self.create_no_sets_container()
+        self.no_sets_container.hide()
+        layout.addWidget(self.no_sets_container)
+        
+        # Shown if the sets can't be loaded
+        self.error_label = QLabel()
+        self.error_label.setStyleSheet(self.styles["error_label"])
+        self.error_label.hide()
+        layout.addWidget(self.error_label)
         
         self.setLayout(layout)
     
+    def schedule_search(self):
+        """Restart the debounce timer on every keystroke"""
+        self.search_debounce.start()
+    
+    def run_search(self):
+        if self.set_search is None:
+            return
+        # A newer query replaces one still running
+        self.search_job = self.set_search.start(self.search_input.text(), self.fuzzy_check.isChecked())
+        self.search_step_timer.start()
+        self.continue_search()
+    
+    def continue_search(self):
+        """Check the next slice of sets, keeping the page responsive on large libraries"""
+        if self.search_job is None:
+            return
+        if not self.search_job.step(SEARCH_SLICE_SETS):
+            if not self.set_search.index_ready:
+                # Nothing to do until the index is loaded - search_index_ready resumes it
+                self.search_step_timer.stop()
+            return
+        self.search_step_timer.stop()
+        self.search_results = self.search_job.results()
+        self.search_job = None
+        self.filter_sets()
+    
+    def resume_search(self):
+        if self.search_job is not None and not self.search_job.done:
+            self.search_step_timer.start()
+    
     def filter_sets(self):
-        """Filter flashcard sets based on search text and difficulty"""
-        search_text = self.search_input.text().strip().lower()
+        """Filter flashcard sets based on search results and difficulty"""
         difficulty_filter = self.difficulty_filter.currentText()
         
-        # Clear existing sets
-        for i in reversed(range(self.sets_layout.count())):
-            widget = self.sets_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        
-        # Start with all sets
-        filtered_sets = self.all_sets
-        
-        # Apply difficulty filter
-        if difficulty_filter != "All":
-            filtered_sets = [
-                flashcard_set for flashcard_set in filtered_sets
-                if flashcard_set.get('difficulty', 'Easy') == difficulty_filter
-            ]
-        
-        # Apply search filter
-        if search_text:
-            filtered_sets = [
-                flashcard_set for flashcard_set in filtered_sets
-            if flashcard_set['set_name'].lower().startswith(search_text)
-        ]
-        
-        if filtered_sets:
+        # Apply search filter (results are already ranked)
+        candidates = range(len(self.all_sets)) if self.search_results is None else self.search_results
+        
+        rows = []
+        for i in candidates:
+            # Apply difficulty filter
+            if difficulty_filter != "All" and self.all_sets[i].get('difficulty', 'Easy') != difficulty_filter:
+                continue
+            rows.append(i)
+        
+        # Only the model's visible rows change - no card widgets are rebuilt
+        self.sets_model.set_rows(rows)
+        
+        if rows:
             self.no_results_label.hide()  # HIDE label when sets are found
-            self.display_sets(filtered_sets)
         else:
             # Show no results message
             self.no_results_label.show()
     
     def display_sets(self, sets_to_display):
         """Display the given list of flashcard sets"""
-        # Clear existing sets
-        for i in reversed(range(self.sets_layout.count())):
-            widget = self.sets_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-        
-        if not sets_to_display:
-            # Show no sets message
-            no_sets_container = self.create_no_sets_container()
-            self.sets_layout.addWidget(no_sets_container, 0, 0)
-            return
+        self.sets_model.set_sets(sets_to_display)
         
-        # Add each set as a styled card
-        row, col = 0, 0
-        for flashcard_set in sets_to_display:
-            set_card = self.create_set_card(flashcard_set)
-            self.sets_layout.addWidget(set_card, row, col)
-            
-            col += 1
-            if col > 1:  # 2 cards per row
-                col = 0
-                row += 1
+        # Show no sets message instead of an empty grid
+        self.no_sets_container.setVisible(not sets_to_display)
+        self.sets_view.setVisible(bool(sets_to_display))
     
     def load_flashcards(self):
         try:
             # Clear search when refreshing
             self.search_input.clear()
+            self.search_debounce.stop()
+            self.search_step_timer.stop()
+            self.search_job = None
+            self.search_results = None
             self.no_results_label.hide()
+            self.error_label.hide()
             
-            # Clear existing sets
-            for i in reversed(range(self.sets_layout.count())):
-                widget = self.sets_layout.itemAt(i).widget()
-                if widget:
-                    widget.setParent(None)
-            
-            # Import and use controller to load saved sets
-            from core.controller import FlashcardController
-            username = self.main_window.get_current_username() if self.main_window else None
-            controller = FlashcardController(username)
-            self.all_sets = controller.get_all_sets()
+            # Only summaries are needed for the grid - cards load when a set is opened
+            controller = self._get_controller()
+            self.all_sets = controller.get_set_summaries()
+            self.set_search = controller.get_set_search(self.all_sets, self.search_index_ready.emit)
             
             # Display all sets
             self.display_sets(self.all_sets)
+            self.update_due_count(controller)
                     
         except Exception as e:
-            error_label = QLabel(f"Error loading flashcards:\n{str(e)}")
-            error_label.setStyleSheet(self.styles["error_label"])
-            self.sets_layout.addWidget(error_label)
+            self.error_label.setText(f"Error loading flashcards:\n{str(e)}")
+            self.error_label.show()
+    
+    def update_due_count(self, controller=None):
+        """Show how many cards are due today on the review button (read from the due index)"""
+        due_count = (controller or self._get_controller()).count_due_cards()
+        self.review_due_btn.setText(f"Review Due ({due_count})")
+        self.review_due_btn.setEnabled(due_count > 0)
+    
+    def start_due_review(self):
+        review_set = self._get_controller().get_due_review_set()
+        if not review_set['cards']:
+            QMessageBox.information(self, "Nothing Due", "No cards are due for review today.")
+            self.update_due_count()
+            return
+        self.main_window.show_flashcard_study_with_set(review_set)
+    
+    def _get_controller(self):
+        from core.controller import FlashcardController
+        username = self.main_window.get_current_username() if self.main_window else None
+        return FlashcardController(username)
+    
+    def _load_full_set(self, summary):
+        """Load a set's cards and progress when the user actually opens it"""
+        flashcard_set = self._get_controller().get_study_set(summary['set_name'])
+        if flashcard_set is None:
+            QMessageBox.warning(self, "Error", f"Flashcard set '{summary['set_name']}' could not be loaded.")
+            self.load_flashcards()
+        return flashcard_set
     
     def create_no_sets_container(self):
         """Create container for no sets message"""
@@ -226,68 +294,6 @@ class AllCards(QWidget):
         
         return no_sets_container
         
-    def create_set_card(self, flashcard_set):
-        # Create a styled card for a flashcard set
-        card_frame = QFrame()
-        
-        # Get current grid position
-        total_cards = self.sets_layout.count()
-        row = total_cards // 2  # Integer division for row number
-        color_index = row % 4   # Cycle through 4 colors per row
-        
-        # Apply the color using the style system
-        if color_index == 0:
-            card_frame.setStyleSheet(self.styles["card_frame_1"])  # Blue
-        elif color_index == 1:
-            card_frame.setStyleSheet(self.styles["card_frame_2"])  # Green
-        elif color_index == 2:
-            card_frame.setStyleSheet(self.styles["card_frame_3"])  # Yellow
-        else:
-            card_frame.setStyleSheet(self.styles["card_frame_4"])  # Red
-        
-        card_frame.setMinimumWidth(200)
-        
-        card_layout = QVBoxLayout(card_frame)
-        card_layout.setSpacing(10)
-        card_layout.setContentsMargins(15, 15, 15, 15)
-        
-        # Set name
-        name_label = QLabel(flashcard_set['set_name'])
-        name_label.setStyleSheet(self.styles["card_name"])
-        name_label.setWordWrap(True)
-        card_layout.addWidget(name_label)
-        
-        # Difficulty level text below set name
-        difficulty = flashcard_set.get('difficulty', 'Easy')
-        difficulty_label = QLabel(f"Difficulty level: {difficulty}")
-        difficulty_label.setStyleSheet(self.label_styles["difficulty_level_card"])
-        card_layout.addWidget(difficulty_label)
-        
-        # Set info
-        info_text = f"Cards: {len(flashcard_set['cards'])}\nCreated: {flashcard_set['created_date']}"
-        info_label = QLabel(info_text)
-        info_label.setStyleSheet(self.styles["info_label"])
-        card_layout.addWidget(info_label)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        
-        # Study button
-        study_btn = QPushButton("Study")
-        study_btn.setStyleSheet(self.styles["study_button"])
-        study_btn.clicked.connect(lambda: self.study_set(flashcard_set))
-        button_layout.addWidget(study_btn)
-        
-        # Delete button
-        delete_btn = QPushButton("Delete")
-        delete_btn.setStyleSheet(self.styles["delete_button"])
-        delete_btn.clicked.connect(lambda: self.delete_set(flashcard_set['set_name']))
-        button_layout.addWidget(delete_btn)
-        
-        card_layout.addLayout(button_layout)
-        
-        return card_frame
-        
     def study_set(self, flashcard_set):
         print(f"Study set clicked: {flashcard_set['set_name']}")  
 
@@ -307,7 +313,7 @@ class AllCards(QWidget):
             layout.addWidget(title)
             
             # Cards count info
-            cards_info = QLabel(f"Cards in set: {len(flashcard_set['cards'])}")
+            cards_info = QLabel(f"Cards in set: {flashcard_set['card_count']}")
             cards_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
             cards_info.setStyleSheet(self.styles["cards_info"])
             layout.addWidget(cards_info)
@@ -325,12 +331,9 @@ class AllCards(QWidget):
             # Multiple Choice button
             mc_btn = QPushButton("Multiple Choice")
             
-            # Check if enough cards for multiple choice
-            if len(flashcard_set['cards']) < 4:
-                mc_btn.clicked.connect(lambda: self.show_mc_warning(study_dialog))
-            else:
-                mc_btn.setStyleSheet(self.styles["mc_button"])
-                mc_btn.clicked.connect(lambda: self.start_multiple_choice_study(flashcard_set, study_dialog))
+            # Small sets are checked when started - they may borrow options from other sets
+            mc_btn.setStyleSheet(self.styles["mc_button"])
+            mc_btn.clicked.connect(lambda: self.start_multiple_choice_study(flashcard_set, study_dialog))
             
             buttons_layout.addWidget(mc_btn)
             
@@ -371,6 +374,9 @@ class AllCards(QWidget):
                 break
         
         if create_page:
+            flashcard_set = self._load_full_set(flashcard_set)
+            if flashcard_set is None:
+                return
             # Load the existing flashcard set into the create page
             self.load_flashcards_into_create_page(create_page, flashcard_set)
             # Switch to create flashcard page
@@ -383,32 +389,32 @@ class AllCards(QWidget):
         # Simply call the new method in create_page
         create_page.load_flashcards_for_editing(flashcard_set)
 
-    def show_mc_warning(self, dialog):
-        # Show warning when not enough cards for multiple choice
-        from PyQt6.QtWidgets import QMessageBox
-        QMessageBox.warning(
-            self, 
-            "Not Enough Cards", 
-            "Multiple Choice mode requires at least 4 cards in the set.\n\n"
-            "Please add more cards to use this study mode."
-        )
-        # Don't close the dialog - let user choose another option
-
     def start_flip_card_study(self, flashcard_set, dialog):
         # Start flip card study
         dialog.accept()
-        self.main_window.show_flashcard_study_with_set(flashcard_set)
+        flashcard_set = self._load_full_set(flashcard_set)
+        if flashcard_set:
+            self.main_window.show_flashcard_study_with_set(flashcard_set)
 
     def start_multiple_choice_study(self, flashcard_set, dialog):
-        # Check if there are enough unique answers for multiple choice
-        unique_answers = set(card['answer'] for card in flashcard_set['cards'])
-        
-        if len(unique_answers) < 4:
+        # Check if there are enough unique answers for multiple choice (counted when the set was saved)
+        answer_count = flashcard_set['answer_count']
+        borrowed_answers = ()
+        
+        if answer_count < 4:
+            # Other sets of the same difficulty may have enough answers to lend
+            borrowed_answers = self._get_controller().get_borrowed_answers(flashcard_set)
+            can_borrow = answer_count + len(borrowed_answers) >= 4
+            difficulty = flashcard_set.get('difficulty', 'Easy')
+            
             # Show warning - not enough unique answers
             msg_box = QMessageBox(self)
             msg_box.setWindowTitle("Not Enough Options")
-            msg_box.setText(f"This flashcard set only has {len(unique_answers)} unique answer(s).")
-            msg_box.setInformativeText("Multiple choice requires at least 4 unique answers.\n\nPlease add more cards with different answers or use Flip Card mode instead.")
+            msg_box.setText(f"This flashcard set only has {answer_count} unique answer(s).")
+            if can_borrow:
+                msg_box.setInformativeText(f"Multiple choice requires at least 4 unique answers.\n\nWrong options can be borrowed from your other {difficulty} sets, or you can add more cards with different answers.")
+            else:
+                msg_box.setInformativeText("Multiple choice requires at least 4 unique answers.\n\nPlease add more cards with different answers or use Flip Card mode instead.")
             msg_box.setStyleSheet(self.styles["warning_message_box"])
             
             # Add custom icon
@@ -421,14 +427,22 @@ class AllCards(QWidget):
                     icon_size = int(min(screen_size.width(), screen_size.height()) * 0.05)
                     msg_box.setIconPixmap(custom_icon.scaled(icon_size, icon_size, Qt.AspectRatioMode.KeepAspectRatio))
             
-            msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
+            if can_borrow:
+                borrow_btn = msg_box.addButton("Borrow from Other Sets", QMessageBox.ButtonRole.AcceptRole)
+                msg_box.addButton(QMessageBox.StandardButton.Cancel)
+            else:
+                borrow_btn = None
+                msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
             msg_box.exec()
-            # Don't close dialog - let user choose another option
-            return
+            if borrow_btn is None or msg_box.clickedButton() != borrow_btn:
+                # Don't close dialog - let user choose another option
+                return
         
         # Start multiple choice study
         dialog.accept()
-        self.main_window.show_multiple_choice_study(flashcard_set)
+        flashcard_set = self._load_full_set(flashcard_set)
+        if flashcard_set:
+            self.main_window.show_multiple_choice_study(flashcard_set, borrowed_answers)
     
     def delete_set(self, set_name):
         # Create message box
@@ -456,11 +470,7 @@ class AllCards(QWidget):
         reply = msg_box.exec()
         
         if reply == QMessageBox.StandardButton.Yes:
-            from core.controller import FlashcardController
-            username = self.main_window.get_current_username() if self.main_window else None
-            controller = FlashcardController(username)
-            
-            error_message = controller.delete_flashcard_set(set_name)
+            error_message = self._get_controller().delete_flashcard_set(set_name)
             
             if error_message:
                 QMessageBox.critical(self, "Delete Error", f"Failed to delete set:\n{error_message}")
@@ -202,6 +202,7 @@ class CreateFlashcard(QWidget):
         card_frame.answer_input = answer_input
         card_frame.hint_input = hint_input
         card_frame.card_number = self.current_card_number
+        card_frame.card_id = None  # Set when an existing card is loaded for editing
         
         # Add widgets to card layout
         card_layout.addLayout(card_header)
@@ -350,6 +351,9 @@ class CreateFlashcard(QWidget):
                                 'question': question,
                                 'answer': answer
                             }
+                            # Keep the id of a card loaded for editing so its progress survives
+                            if getattr(widget, 'card_id', None):
+                                card_data['id'] = widget.card_id
                             # Add custom hint if provided
                             if hint:
                                 card_data['custom_hint'] = hint
@@ -378,17 +382,10 @@ class CreateFlashcard(QWidget):
             was_editing = hasattr(self, 'original_set_name') and self.original_set_name
             
             if was_editing:
-                print(f"DEBUG: Updating set - deleting original: '{self.original_set_name}'")
-                
-                # Always delete the original set first when editing
-                delete_error = controller.delete_flashcard_set(self.original_set_name)
-                
-                if delete_error:
-                    self.show_warning_message("Update Error", f"Failed to update flashcard set:\n{delete_error}")
-                    return
-                
-                # Then create the updated set with difficulty
-                error_message = controller.create_flashcard_set(set_name, self.flashcards, difficulty)
+                # One write replaces the set and keeps progress of unchanged cards
+                error_message = controller.update_flashcard_set(
+                    self.original_set_name, set_name, self.flashcards, difficulty
+                )
                 
                 # Update original_set_name to the new name (in case it was renamed)
                 if not error_message:
@@ -619,6 +616,7 @@ class CreateFlashcard(QWidget):
                         # Populate with existing data
                         card_frame.question_input.setText(card['question'])
                         card_frame.answer_input.setPlainText(card['answer'])
+                        card_frame.card_id = card.get('id')
                         # Load custom hint if exists
                         if hasattr(card_frame, 'hint_input') and 'custom_hint' in card:
                             card_frame.hint_input.setText(card.get('custom_hint', ''))
@@ -1,9 +1,11 @@
 # FINAL PROJECT FLASHCARD APP / ui / pages / flashcard_study_multiple_choice_page.py
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                            QFrame, QRadioButton, QButtonGroup)
+                            QFrame, QRadioButton, QButtonGroup, QCheckBox)
 from PyQt6.QtCore import Qt
 from ui.visual.styles.styles import get_multiple_choice_styles
+from core.distractors import DistractorPool
+from core.quiz_deck import QuizDeck, get_requeue_policy
 import random
 
 class MultipleChoiceStudy(QWidget):
@@ -17,9 +19,10 @@ class MultipleChoiceStudy(QWidget):
         self.styles = get_multiple_choice_styles()
         
         # Card deck system to prevent infinite loops
-        self.card_deck = []
-        self.mastered_cards = []
-        self.total_cards = 0
+        self.deck = QuizDeck([])
+        
+        # Distinct answers of the set, built once and reused when the quiz restarts
+        self.distractors = DistractorPool([])
         
         self.setup_ui()
     
@@ -32,21 +35,41 @@ class MultipleChoiceStudy(QWidget):
         else:
             super().keyPressEvent(event)
         
-    def update_flashcard_set(self, flashcard_set):
-        """Update the flashcard set and reset the study session"""
+    def update_flashcard_set(self, flashcard_set, borrowed_answers=()):
+        """Update the flashcard set and reset the study session
+
+        borrowed_answers (from other sets) fill in wrong options a small set lacks.
+        """
         self.flashcard_set = flashcard_set
+        self.distractors = DistractorPool.from_set(flashcard_set or {}, borrowed_answers)
+        
+        # Pick up an unfinished quiz on this set where it left off
+        state = None
+        if self.flashcard_set and self.flashcard_set.get('cards'):
+            state = self._get_controller().get_study_session("mc", self.flashcard_set)
+        self.start_quiz(state)
+    
+    def _get_controller(self):
+        from core.controller import FlashcardController
+        username = self.main_window.get_current_username() if self.main_window else None
+        return FlashcardController(username)
+    
+    def start_quiz(self, state=None):
+        """Start a new session over the current set (or continue a saved one)"""
         self.current_card_index = 0
-        self.correct_count = 0
-        self.wrong_count = 0
+        self.correct_count = state.get('correct', 0) if state else 0
+        self.wrong_count = state.get('wrong', 0) if state else 0
         
         # Initialize card deck system
         if self.flashcard_set and self.flashcard_set.get('cards'):
-            import copy
-            self.card_deck = copy.deepcopy(self.flashcard_set['cards'])
-            self.mastered_cards = []
-            self.total_cards = len(self.card_deck)
+            # Positions into the set's own card list - nothing is copied
+            policy, gap = get_requeue_policy()
+            if state:
+                self.deck = QuizDeck.from_state(self.flashcard_set['cards'], state, policy, gap)
+            else:
+                self.deck = QuizDeck(self.flashcard_set['cards'], policy, gap)
+                self.save_session()
             self.last_answer_correct = False
-            random.shuffle(self.card_deck)
             
             # Force uncheck all radio buttons before loading
             if hasattr(self, 'option_buttons'):
@@ -56,6 +79,11 @@ class MultipleChoiceStudy(QWidget):
                 for btn in self.option_buttons:
                     btn.setAutoExclusive(True)
             
+            # Completion rewires the button to "Try Again"
+            self.next_btn.setText("Next Question")
+            self.next_btn.clicked.disconnect()
+            self.next_btn.clicked.connect(self.next_question)
+            
             self.load_question()
         
     def setup_ui(self):
@@ -70,7 +98,7 @@ class MultipleChoiceStudy(QWidget):
         # Back button
         back_btn = QPushButton("← Back")
         back_btn.setStyleSheet(self.styles["back_button"])
-        back_btn.clicked.connect(lambda: self.main_window.show_page(3))
+        back_btn.clicked.connect(self.go_back)
         back_btn.setFocusPolicy(Qt.FocusPolicy.NoFocus)  # Prevent space bar activation
         header_layout.addWidget(back_btn)
         
@@ -83,6 +111,13 @@ class MultipleChoiceStudy(QWidget):
         
         header_layout.addStretch()
         
+        # Hard mode - wrong options that look like the right answer
+        self.hard_mode_check = QCheckBox("Hard options")
+        self.hard_mode_check.setStyleSheet(self.styles["hard_mode_checkbox"])
+        self.hard_mode_check.setFocusPolicy(Qt.FocusPolicy.NoFocus)  # Prevent space bar activation
+        header_layout.addWidget(self.hard_mode_check)
+        header_layout.addSpacing(15)
+        
         # Stats
         self.stats_label = QLabel("Question 1 of 1")
         self.stats_label.setStyleSheet(self.styles["stats_label"])
@@ -152,32 +187,34 @@ class MultipleChoiceStudy(QWidget):
     def load_question(self):
         """Load current question with multiple choice options using card deck system"""
         # Check if deck is empty
-        if not self.card_deck:
+        if not self.deck:
             self.show_completion()
             return
         
         # Get current card from deck
-        current_card = self.card_deck[0]
+        current_card = self.deck.current()
         self.question_label.setText(current_card['question'])
         
         # Reset mistake tracker for THIS NEW appearance
         self.had_mistake_this_appearance = False
         
         # Update stats - show progress through total cards
-        remaining = len(self.card_deck)
-        mastered = len(self.mastered_cards)
-        self.stats_label.setText(f"Remaining: {remaining} | Mastered: {mastered}/{self.total_cards}")
+        remaining = len(self.deck)
+        mastered = len(self.deck.mastered)
+        self.stats_label.setText(f"Remaining: {remaining} | Mastered: {mastered}/{self.deck.total}")
         self.set_name_label.setText(self.flashcard_set.get('set_name', 'Multiple Choice'))
         
         # Generate options
         correct_answer = current_card['answer']
         
-        # Get all available cards for wrong options (from both deck and mastered)
-        all_available_cards = self.card_deck + self.mastered_cards
-        other_answers = [card['answer'] for card in all_available_cards if card['answer'] != correct_answer]
+        # Wrong options come from the set's precomputed answer pool
+        if self.hard_mode_check.isChecked():
+            wrong_options = self.distractors.sample_hard(correct_answer)
+        else:
+            wrong_options = self.distractors.sample(correct_answer)
         
         # Check if we have enough unique answers
-        if len(other_answers) < 3:
+        if len(wrong_options) < 3:
             # Not enough options - show error and complete
             self.question_label.setText("⚠️ Not enough unique answers to generate options!")
             self.result_label.setText("Please add more cards with different answers.")
@@ -192,10 +229,6 @@ class MultipleChoiceStudy(QWidget):
             self.next_btn.clicked.connect(lambda: self.main_window.show_page(3))
             return
         
-        # Shuffle and select wrong options
-        random.shuffle(other_answers)
-        wrong_options = other_answers[:3]
-        
         # Combine and shuffle all options
         all_options = [correct_answer] + wrong_options
         random.shuffle(all_options)
@@ -273,21 +306,14 @@ class MultipleChoiceStudy(QWidget):
         
     def next_question(self):
         """Move to next question using card deck system"""
-        if not self.card_deck:
+        if not self.deck:
             self.show_completion()
             return
         
-        current_card = self.card_deck[0]
-        
-        # Only remove if answered correctly on FIRST TRY (no mistakes this appearance)
-        if not self.had_mistake_this_appearance:
-            # First try correct - remove from deck and add to mastered
-            self.card_deck.pop(0)
-            self.mastered_cards.append(current_card)
-        else:
-            # Had mistakes - move to back of deck for another try
-            self.card_deck.pop(0)
-            self.card_deck.append(current_card)
+        # Only remove if answered correctly on FIRST TRY (no mistakes this appearance);
+        # otherwise it goes back in the deck (at the back or a few cards later) for another try
+        self.deck.advance(mastered=not self.had_mistake_this_appearance)
+        self.save_session()
         
         # Uncheck all radio buttons to clear selection color
         for btn in self.option_buttons:
@@ -296,13 +322,23 @@ class MultipleChoiceStudy(QWidget):
         # Load next question (which will reset had_mistake_this_appearance)
         self.load_question()
         
+    def save_session(self):
+        """Checkpoint the deck and score (card ids and counters) - written in the background"""
+        state = self.deck.to_state()
+        state['correct'] = self.correct_count
+        state['wrong'] = self.wrong_count
+        self._get_controller().checkpoint_study_session("mc", self.flashcard_set, state)
+    
     def show_completion(self):
         """Show completion message with detailed stats"""
+        # Nothing left to resume
+        self._get_controller().clear_study_session("mc", self.flashcard_set)
+        
         total_attempts = self.correct_count + self.wrong_count
         accuracy = (self.correct_count / total_attempts * 100) if total_attempts > 0 else 0
         
         completion_text = f"🎉 All Cards Mastered!\n\n"
-        completion_text += f"Total Cards: {self.total_cards}\n"
+        completion_text += f"Total Cards: {self.deck.total}\n"
         completion_text += f"Correct Answers: {self.correct_count}\n"
         completion_text += f"Wrong Answers: {self.wrong_count}\n"
         completion_text += f"Accuracy: {accuracy:.1f}%"
@@ -321,7 +357,12 @@ class MultipleChoiceStudy(QWidget):
         self.next_btn.clicked.connect(self.restart_quiz)
         self.next_btn.show()
     
+    def go_back(self):
+        # Save where the quiz is before leaving it
+        self._get_controller().flush_progress()
+        self.main_window.show_page(3)
+    
     def restart_quiz(self):
         """Restart the quiz with the same flashcard set"""
-        # Re-initialize with the same flashcard set
-        self.update_flashcard_set(self.flashcard_set)
+        # Same set, so the answer pool is kept
+        self.start_quiz()
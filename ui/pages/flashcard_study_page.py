@@ -4,6 +4,10 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushBut
                             QFrame, QProgressBar, QCheckBox)
 from PyQt6.QtCore import Qt
 from ui.visual.styles.styles import get_study_page_styles, get_inline_label_styles, get_shuffle_button_active_style
+from core.scheduler import DueQueue, get_schedule, review, is_learned, end_of_day
+from core.study_session import SessionStats, NEW, LEARNING, MASTERED
+from core.hints import get_hint_engine
+from datetime import datetime
 import random
 
 class FlashcardStudyPage(QWidget):
@@ -16,25 +20,25 @@ class FlashcardStudyPage(QWidget):
         self.styles = get_study_page_styles()
         self.label_styles = get_inline_label_styles()
         
-        # Hybrid hint system variables
+        # Hint steps of the current card, precomputed by the hint engine
+        self.hint_engine = get_hint_engine()
         self.current_hint_level = 0
-        self.max_hint_level = 1
-        self.hint_strategy = 'word_by_word'
-        self.answer_words = ['']
+        self.hint_steps = []
         
-        # Simple progress tracking
-        self.card_progress = {}
+        # Spaced repetition - cards come up in order of when they are due
+        self.due_queue = None
+        self.card_positions = {}  # Card id -> position in the set
+        self.session_stats = SessionStats([])  # Mastered / learning / new counts
         
-        # Shuffle toggle functionality
+        # Shuffle toggle functionality - a permutation over the set's cards, which never move
         self.is_shuffled = False
-        self.original_card_order = []
+        self.shuffle_order = None  # Card positions in shuffled order (None = the set's order)
+        self.shuffle_ranks = None  # Card position -> place in shuffle_order
+        self.shuffle_seed = None  # Reproduces the same order
         
         self.setup_ui()
         if self.flashcard_set and self.flashcard_set['cards']:
-            # Store original order
-            import copy
-            self.original_card_order = copy.deepcopy(self.flashcard_set['cards'])
-            self.load_card(0)
+            self.start_session()
     
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -137,6 +141,12 @@ class FlashcardStudyPage(QWidget):
         self.progress_bar.setMaximum(100)
         self.progress_bar.setStyleSheet(self.styles["progress_bar"])
         layout.addWidget(self.progress_bar)
+        
+        # Mastered / learning / new counts below the bar (per difficulty in its tooltip)
+        self.progress_breakdown_label = QLabel()
+        self.progress_breakdown_label.setStyleSheet(self.styles["progress_breakdown"])
+        self.progress_breakdown_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.progress_breakdown_label)
     
     def setup_flip_card(self):
         # Create front card with counter
@@ -252,30 +262,6 @@ class FlashcardStudyPage(QWidget):
             self.card_back.show()
         self.is_flipped = not self.is_flipped
     
-    def analyze_answer_type(self, answer):
-        """Determine if answer is single word or sentence and choose hint strategy"""
-        try:
-            if not answer or not isinstance(answer, str):
-                return 'word_by_word', [''], 1
-                
-            clean_answer = answer.strip()
-            if not clean_answer:
-                return 'word_by_word', [''], 1
-                
-            words = clean_answer.split()
-            
-            # Single word: just one word with reasonable length
-            if len(words) == 1 and len(clean_answer) <= 20:
-                return 'letter_by_letter', [clean_answer], len(clean_answer)
-            
-            # Sentence: use word-by-word revelation
-            else:
-                return 'word_by_word', words, len(words)
-                
-        except Exception as e:
-            print(f"Error analyzing answer type: {e}")
-            return 'word_by_word', [answer], 1
-    
     def load_card(self, index):
         try:
             if not self.flashcard_set or not self.flashcard_set['cards']:
@@ -290,9 +276,8 @@ class FlashcardStudyPage(QWidget):
                 self.front_label.setText(f"{card['question']}")
                 self.back_label.setText(f"{card['answer']}")
                 
-                # Analyze answer and set up HYBRID hint system
-                answer = card['answer'].strip()
-                self.hint_strategy, self.answer_words, self.max_hint_level = self.analyze_answer_type(answer)
+                # Hint steps were worked out when the set was opened
+                self.hint_steps = self.hint_engine.plan(card)
                 
                 # Reset hint state
                 self.current_hint_level = 0
@@ -315,105 +300,33 @@ class FlashcardStudyPage(QWidget):
             self.back_label.setText("Please try another card")
     
     def show_hint(self):
-        """HYBRID SYSTEM: Show hint using appropriate strategy based on answer type"""
+        """Reveal the next precomputed hint step (custom hint, letters, words, ...)"""
         try:
-            if not self.flashcard_set or not self.flashcard_set['cards']:
+            if not self.flashcard_set or not self.flashcard_set['cards'] or not self.hint_steps:
                 return
             
-            current_card = self.flashcard_set['cards'][self.current_card_index]
-            
-            # Check if custom hint exists
-            if 'custom_hint' in current_card and current_card['custom_hint']:
-                # Show custom hint
-                self.hint_label.setText(f"<b>Hint:</b> {current_card['custom_hint']}")
-                self.hint_label.show()
-                self.hint_btn.setText("Full Answer")
-                self.hint_btn.setEnabled(False)
-                return
-                
-            self.current_hint_level += 1
-            
             # Ensure we don't exceed bounds
-            self.current_hint_level = min(self.current_hint_level, self.max_hint_level)
-            
-            if self.hint_strategy == 'letter_by_letter':
-                self._show_letter_hint()
-            else:  # word_by_word
-                self._show_word_hint()
+            self.current_hint_level = min(self.current_hint_level + 1, len(self.hint_steps))
+            self.hint_label.setText(self.hint_steps[self.current_hint_level - 1])
+            self.hint_label.show()
             
             # Update button
-            if self.current_hint_level >= self.max_hint_level:
+            if self.current_hint_level >= len(self.hint_steps):
                 self.hint_btn.setText("Full Answer")
                 self.hint_btn.setEnabled(False)
             else:
-                self.hint_btn.setText(f"Show Hint ({self.current_hint_level}/{self.max_hint_level})")
+                self.hint_btn.setText(f"Show Hint ({self.current_hint_level}/{len(self.hint_steps)})")
                 
         except Exception as e:
             print(f"Error showing hint: {e}")
             self.hint_label.setText("Error showing hint")
             self.hint_label.show()
     
-    def _show_letter_hint(self):
-        """Letter-by-letter hint for single words"""
-        try:
-            if not self.answer_words or not self.answer_words[0]:
-                self.hint_label.setText("<b>Hint:</b> No hint available")
-                self.hint_label.show()
-                return
-                
-            word = self.answer_words[0]
-            if self.current_hint_level >= len(word):
-                # Full word revealed
-                hint_text = f"<b>Hint:</b> {word}"
-            else:
-                # Partial reveal with underscores
-                revealed = word[:self.current_hint_level]
-                remaining = " ".join(["_"] * (len(word) - self.current_hint_level))
-                hint_text = f"<b>Hint:</b> {revealed} {remaining}"
-            
-            self.hint_label.setText(hint_text)
-            self.hint_label.show()
-            
-        except Exception as e:
-            print(f"Error in letter hint: {e}")
-            self.hint_label.setText("<b>Hint:</b> Error")
-            self.hint_label.show()
-    
-    def _show_word_hint(self):
-        """Word-by-word hint for sentences"""
-        try:
-            if not self.answer_words:
-                self.hint_label.setText("<b>Hint:</b> No hint available")
-                self.hint_label.show()
-                return
-                
-            # Ensure we don't go out of bounds
-            safe_hint_level = min(self.current_hint_level, len(self.answer_words))
-            revealed_words = self.answer_words[:safe_hint_level]
-            remaining_count = len(self.answer_words) - safe_hint_level
-            
-            # Create the hint display
-            if safe_hint_level >= len(self.answer_words):
-                # Full sentence revealed
-                full_sentence = " ".join(self.answer_words)
-                hint_text = f"<b>Hint:</b> {full_sentence}"
-            else:
-                # Partial reveal with blanks for remaining words
-                revealed_part = " ".join(revealed_words)
-                blanks = " ".join(["_____"] * remaining_count)
-                hint_text = f"<b>Hint:</b> {revealed_part} {blanks}"
-            
-            self.hint_label.setText(hint_text)
-            self.hint_label.show()
-            
-        except Exception as e:
-            print(f"Error in word hint: {e}")
-            self.hint_label.setText("<b>Hint:</b> Error")
-            self.hint_label.show()
-    
     def update_card_counter(self):
         total = len(self.flashcard_set['cards'])
-        current = self.current_card_index + 1
+        # Count in the order the cards are being studied
+        rank = self.shuffle_ranks[self.current_card_index] if self.shuffle_ranks else self.current_card_index
+        current = rank + 1
         counter_text = f"Card {current} of {total}"
         self.front_counter.setText(counter_text)
         self.back_counter.setText(counter_text)
@@ -430,18 +343,96 @@ class FlashcardStudyPage(QWidget):
             self.front_card_difficulty.setText("")
             self.back_card_difficulty.setText("")
     
+    def _get_controller(self):
+        from core.controller import FlashcardController
+        username = self.main_window.get_current_username() if self.main_window else None
+        return FlashcardController(username)
+    
+    def resume_session(self):
+        """Start studying the set, picking up where the last session on it left off"""
+        # Every card's hints are worked out now, so revealing one is just a lookup
+        self.hint_engine = get_hint_engine()
+        self.hint_engine.warm(self.flashcard_set['cards'])
+        state = None
+        # The cross-set review is rebuilt from what is due, so it isn't resumed
+        if self.flashcard_set['cards'] and not self.flashcard_set.get('review'):
+            state = self._get_controller().get_study_session("flip", self.flashcard_set)
+        if state and state.get('shuffle_seed') is not None:
+            self.apply_shuffle(state['shuffle_seed'])
+        self.start_session(state.get('current') if state else None)
+    
+    def save_session(self):
+        """Checkpoint the session (current card and shuffle seed) - written in the background"""
+        if self.flashcard_set.get('review') or not self.flashcard_set['cards']:
+            return
+        current_card = self.flashcard_set['cards'][self.current_card_index]
+        self._get_controller().checkpoint_study_session("flip", self.flashcard_set, {
+            'current': current_card['id'],
+            'shuffle_seed': self.shuffle_seed
+        })
+    
+    def start_session(self, resume_card_id=None):
+        """Queue the set's cards by due date and show the first one due (or resume_card_id)"""
+        cards = self.flashcard_set['cards']
+        # Reviewing everything due today (cards from several sets) shows them all without waiting
+        reviewing = bool(self.flashcard_set.get('review'))
+        # Cards due at the same time (e.g. new ones) follow the current order
+        self.due_queue = DueQueue(cards, end_of_day() if reviewing else None, self.shuffle_order)
+        self.reset_btn.setVisible(not reviewing)
+        self.card_positions = {card['id']: i for i, card in enumerate(cards)}
+        # Counted once here, then kept up to date per answer
+        self.session_stats = SessionStats(cards, self.flashcard_set.get('difficulty', 'Easy'))
+        self.correct_btn.setEnabled(True)
+        self.wrong_btn.setEnabled(True)
+        self.hint_btn.setEnabled(True)
+        if resume_card_id is not None and self.due_queue.take(resume_card_id):
+            # Back on the card the last session stopped at
+            self.load_card(self.card_positions[resume_card_id])
+        else:
+            self.show_next_card()
+    
+    def show_next_card(self):
+        """Load the card that most needs review, or say there is nothing left for now"""
+        if not self.flashcard_set['cards']:
+            self.load_card(0)
+            return
+        card_id = self.due_queue.pop_due()
+        if card_id is None:
+            self.show_caught_up()
+        else:
+            self.load_card(self.card_positions[card_id])
+            self.save_session()
+    
+    def show_caught_up(self):
+        next_due = self.due_queue.next_due()
+        self.front_label.setText("🎉 All caught up!")
+        if next_due is not None:
+            next_review = datetime.fromtimestamp(next_due).strftime("%Y-%m-%d %H:%M")
+            self.back_label.setText(f"Next review: {next_review}")
+        else:
+            self.back_label.setText("No cards to review")
+        self.hint_label.hide()
+        self.correct_btn.setEnabled(False)
+        self.wrong_btn.setEnabled(False)
+        self.hint_btn.setEnabled(False)
+        self.update_progress()
+        # Nothing left to resume
+        if not self.flashcard_set.get('review'):
+            self._get_controller().clear_study_session("flip", self.flashcard_set)
+    
     def update_progress(self):
-        # Calculate progress based on mastered cards (3 correct answers)
-        total_cards = len(self.flashcard_set['cards'])
-        mastered_cards = 0
-        
-        for card in self.flashcard_set['cards']:
-            card_id = card['question']  # Use question as unique ID
-            if card_id in self.card_progress and self.card_progress[card_id] >= 2:
-                mastered_cards += 1
+        # Progress is the share of mastered cards (reviewed successfully twice in a row)
+        stats = self.session_stats
+        self.progress_bar.setValue(int(stats.percent(MASTERED)))
+        self.progress_breakdown_label.setText(
+            f"Mastered: {stats.count(MASTERED)}  |  Learning: {stats.count(LEARNING)}  |  New: {stats.count(NEW)}"
+        )
         
-        progress = (mastered_cards / total_cards) * 100 if total_cards > 0 else 0
-        self.progress_bar.setValue(int(progress))
+        lines = []
+        for difficulty, counts in stats.by_difficulty.items():
+            lines.append(f"{difficulty}: {stats.difficulty_percent(difficulty, MASTERED):.0f}% mastered "
+                         f"({counts[MASTERED]} mastered, {counts[LEARNING]} learning, {counts[NEW]} new)")
+        self.progress_bar.setToolTip("\n".join(lines))
     
     def mark_card(self, correct):
         from core.controller import FlashcardController
@@ -449,24 +440,19 @@ class FlashcardStudyPage(QWidget):
         controller = FlashcardController(username)
         
         current_card = self.flashcard_set['cards'][self.current_card_index]
-        card_id = current_card['question']
+        card_id = current_card['id']  # Stable id - safe across shuffles and duplicate questions
         
-        # Update progress tracking
-        if card_id not in self.card_progress:
-            self.card_progress[card_id] = 0
-            
-        if correct:
-            self.card_progress[card_id] += 1
-        else:
-            self.card_progress[card_id] = max(0, self.card_progress[card_id] - 1)
+        # Reschedule the card from this answer
+        schedule = review(get_schedule(current_card), correct)
+        learned = is_learned(schedule)
         
-        # Update database
-        learned = self.card_progress[card_id] >= 2
-        controller.update_card_progress(
-            self.flashcard_set['set_name'],
-            self.current_card_index,
+        # Queue the update - it is written in the background with other answers
+        controller.queue_card_progress(
+            current_card.get('set_name', self.flashcard_set['set_name']),
+            card_id,
             learned,
-            correct
+            correct,
+            schedule
         )
         
         # Update local data
@@ -475,89 +461,73 @@ class FlashcardStudyPage(QWidget):
         
         if correct:
             current_card['progress']['times_correct'] += 1
-            current_card['progress']['learned'] = learned
         else:
             current_card['progress']['times_wrong'] += 1
-            current_card['progress']['learned'] = False
+        current_card['progress']['learned'] = learned
+        current_card['progress'].update(schedule)
+        self.session_stats.update(current_card)
         
-        # Auto-advance to next card
+        # Missed cards come back shortly; the rest wait for their next review
+        self.due_queue.push(card_id, schedule['due'])
         self.update_progress()
-        if self.current_card_index < len(self.flashcard_set['cards']) - 1:
-            self.load_card(self.current_card_index + 1)
-        else:
-            # End of set - show completion if all mastered
-            mastered_count = sum(1 for card in self.flashcard_set['cards'] 
-                               if card['question'] in self.card_progress and self.card_progress[card['question']] >= 2)
-            
-            if mastered_count == len(self.flashcard_set['cards']):
-                self.front_label.setText("🎉 Set Complete!")
-                self.back_label.setText(f"You've mastered all {len(self.flashcard_set['cards'])} cards!")
-                self.correct_btn.setEnabled(False)
-                self.wrong_btn.setEnabled(False)
-                self.hint_btn.setEnabled(False)
-            else:
-                # Loop back to beginning
-                self.load_card(0)
+        self.show_next_card()
     
     def toggle_shuffle(self):
         """Toggle between shuffled and original order"""
-        import copy
-        
         if self.is_shuffled:
-            # Restore original order
-            self.flashcard_set['cards'] = copy.deepcopy(self.original_card_order)
-            self.is_shuffled = False
-            self.shuffle_btn.setText("🔀 Shuffle")
-            self.shuffle_btn.setStyleSheet(self.styles["shuffle_button"])
+            # Restore original order - just drop the permutation
+            self.clear_shuffle()
         else:
-            # Make sure we have the original order saved
-            if not self.original_card_order:
-                self.original_card_order = copy.deepcopy(self.flashcard_set['cards'])
-            
-            # Create a shuffled copy
-            shuffled_cards = copy.deepcopy(self.flashcard_set['cards'])
-            random.shuffle(shuffled_cards)
-            self.flashcard_set['cards'] = shuffled_cards
-            
-            self.is_shuffled = True
-            self.shuffle_btn.setText("↩️ Reset Order")
-            # Change button color to indicate shuffled state
-            self.shuffle_btn.setStyleSheet(get_shuffle_button_active_style())
+            self.apply_shuffle(random.randrange(2 ** 32))
         
-        # Load first card and preserve progress
-        self.load_card(0)
-        self.correct_btn.setEnabled(True)
-        self.wrong_btn.setEnabled(True)
-        self.hint_btn.setEnabled(True)
+        # Requeue in the new order and preserve progress
+        self.start_session()
+    
+    def apply_shuffle(self, seed):
+        """Study the cards in the order given by seed (the same seed gives the same order)"""
+        count = len(self.flashcard_set['cards'])
+        order = list(range(count))
+        random.Random(seed).shuffle(order)
+        ranks = [0] * count
+        for rank, position in enumerate(order):
+            ranks[position] = rank
+        
+        self.shuffle_seed = seed
+        self.shuffle_order = order
+        self.shuffle_ranks = ranks
+        self.is_shuffled = True
+        self.shuffle_btn.setText("↩️ Reset Order")
+        # Change button color to indicate shuffled state
+        self.shuffle_btn.setStyleSheet(get_shuffle_button_active_style())
+    
+    def clear_shuffle(self):
+        self.shuffle_seed = None
+        self.shuffle_order = None
+        self.shuffle_ranks = None
+        self.is_shuffled = False
+        self.shuffle_btn.setText("🔀 Shuffle")
+        self.shuffle_btn.setStyleSheet(self.styles["shuffle_button"])
     
     def reset_progress(self):
         from core.controller import FlashcardController
         username = self.main_window.get_current_username() if self.main_window else None
         controller = FlashcardController(username)
         
-        for i in range(len(self.flashcard_set['cards'])):
-            controller.update_card_progress(
-                self.flashcard_set['set_name'],
-                i,
-                False,
-                False
-            )
-            if 'progress' in self.flashcard_set['cards'][i]:
-                self.flashcard_set['cards'][i]['progress'] = {
-                    'learned': False, 
-                    'times_correct': 0, 
-                    'times_wrong': 0
-                }
-        
-        # Reset local progress tracking
-        self.card_progress = {}
+        # One write clears the whole set, however many cards it has
+        controller.reset_set_progress(self.flashcard_set['set_name'])
+        for card in self.flashcard_set['cards']:
+            card.pop('progress', None)
         
-        self.update_progress()
-        self.load_card(0)
-        self.correct_btn.setEnabled(True)
-        self.wrong_btn.setEnabled(True)
-        self.hint_btn.setEnabled(True)
+        # Recounts the (now all new) cards and shows the first one
+        self.start_session()
 
     
     def go_back(self):
+        # Write any answers still queued before leaving the set
+        from core.controller import FlashcardController
+        username = self.main_window.get_current_username() if self.main_window else None
+        FlashcardController(username).flush_progress()
+        # What is due has changed with this session's answers
+        self.main_window.all_cards_page.update_due_count()
+        
         self.main_window.show_page(3)  # Back to All Cards page
\ No newline at end of file
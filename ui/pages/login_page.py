@@ -5,6 +5,8 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
+from utils.file_helper import atomic_write_json, read_json_with_backup
+
 PROFILE_PATH = "user_profiles.json"  # renamed to support multiple users
 
 def hash_password(password):
@@ -101,11 +103,7 @@ class LoginPage(QWidget):
             return
 
         # Load or create user data
-        if os.path.exists(PROFILE_PATH):
-            with open(PROFILE_PATH, "r") as f:
-                data = json.load(f)
-        else:
-            data = {}
+        data = read_json_with_backup(PROFILE_PATH, default={})
 
         if self.is_creating_account:
             # Create account
@@ -119,8 +117,8 @@ class LoginPage(QWidget):
                 "password": hash_password(password)
             }
 
-            with open(PROFILE_PATH, "w") as f:
-                json.dump(data, f, indent=4)
+            # Temp file + rename so a crash can't wipe every account
+            atomic_write_json(PROFILE_PATH, data, backup=True)
 
             # Reset to login mode after successful registration
             self.reset_fields()
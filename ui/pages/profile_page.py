@@ -70,7 +70,7 @@ class ProfilePage(QWidget):
             
     def save_profile(self):
         """Save profile information to a local JSON file."""
-        import json, os
+        from utils.file_helper import atomic_write_json, read_json_with_backup
         profile_data = {
             "full_name": self.name_input.text(),
             "email": self.email_input.text(),
@@ -78,14 +78,10 @@ class ProfilePage(QWidget):
         }
 
         path = "user_profiles.json"
-        all_data = {}
-        if os.path.exists(path):
-            with open(path, "r") as f:
-                all_data = json.load(f)
+        all_data = read_json_with_backup(path, default={})
 
         all_data[self.username or "unknown"] = profile_data
-        with open(path, "w") as f:
-            json.dump(all_data, f, indent=4)
+        atomic_write_json(path, all_data, backup=True)
         print(f"✅ Saved profile for {self.username or 'unknown'}")
 
     def load_profile(self, username, full_name):
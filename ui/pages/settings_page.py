@@ -157,16 +157,17 @@ class SettingsPage(QWidget):
         theme = self.theme_combo.currentText()
         volume = self.volume_slider.value()
 
-        settings = {
+        # Keep install-level keys (e.g. storage_backend) that this page doesn't edit
+        from utils.file_helper import load_app_settings, atomic_write_json
+        settings = load_app_settings()
+        settings.update({
             "theme": theme,
             "volume": volume,
             "music_enabled": self.sound_check.isChecked()
-        }
+        })
         
         try:
-            import json
-            with open("app_settings.json", "w") as f:
-                json.dump(settings, f, indent=4)
+            atomic_write_json("app_settings.json", settings)
         except Exception as e:
             print(f"Error saving settings: {e}")
 
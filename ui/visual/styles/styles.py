@@ -883,10 +883,70 @@ def get_all_cards_styles():
                 font-weight: 600;
                 padding: 20px;
             }
+        """,
+        "sets_view": """
+            QListView {
+                background-color: transparent;
+                border: none;
+                outline: none;
+            }
+        """,
+        "fuzzy_checkbox": """
+            QCheckBox {
+                color: #2C3E50;
+                font-size: 14px;
+                font-weight: 600;
+                background-color: transparent;
+            }
+            QCheckBox::indicator {
+                width: 16px;
+                height: 16px;
+                border-radius: 4px;
+                background-color: #E3D3C3;
+                border: 2px solid #A2A8D3;
+            }
+            QCheckBox::indicator:checked {
+                background-color: #A2A8D3;
+            }
+        """,
+        
+        "review_due_button": """
+            QPushButton {
+                background-color: #ABABDE;
+                color: white;
+                font-size: 14px;
+                font-weight: 700;
+                border-radius: 15px;
+                padding: 6px 14px;
+                min-height: 40px;
+                outline: none;
+            }
+            QPushButton:hover {
+                background-color: #6AB9F0;
+            }
+            QPushButton:disabled {
+                background-color: #E3D3C3;
+                color: #8A8A8A;
+            }
         """
     }
 
 
+def get_set_card_palette():
+    """Colors for the set cards painted by the All Cards grid (same as the card_frame_* styles)"""
+    return {
+        "backgrounds": ["#B3D9FF", "#B9FBC0", "#FFE6A7", "#FFB3B3"],  # Blue, Green, Yellow, Red
+        "name": "#2c3e50",
+        "difficulty": "black",
+        "info": "#535050",
+        "study_button": "#ABABDE",
+        "study_button_hover": "#6AB9F0",
+        "delete_button": "#BA9C9C",
+        "delete_button_hover": "#F47E66",
+        "button_text": "white"
+    }
+
+
 def get_study_page_styles():    
     return {
         "title": """
@@ -942,6 +1002,15 @@ def get_study_page_styles():
             }
         """,
         
+        "progress_breakdown": """
+            QLabel {
+                color: #2C3E50;
+                font-size: 13px;
+                font-weight: 600;
+                background-color: transparent;
+            }
+        """,
+        
         "shuffle_button": """
             QPushButton {
                 background-color: #585B70;
@@ -1185,6 +1254,25 @@ def get_multiple_choice_styles():
             }
         """,
         
+        "hard_mode_checkbox": """
+            QCheckBox {
+                font-size: 14px;
+                font-weight: 600;
+                color: #5D4037;
+                background-color: transparent;
+            }
+            QCheckBox::indicator {
+                width: 16px;
+                height: 16px;
+                border-radius: 4px;
+                background-color: #F5F1E8;
+                border: 2px solid #D9C4AF;
+            }
+            QCheckBox::indicator:checked {
+                background-color: #D9C4AF;
+            }
+        """,
+        
         "question_label": """
             QLabel {
                 font-size: 16px;
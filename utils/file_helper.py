@@ -0,0 +1,222 @@
+# FINAL PROJECT FLASHCARD APP / utils / file_helper.py
+
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import zlib
+
+# Install-wide settings file (written by the Settings page)
+APP_SETTINGS_FILE = "app_settings.json"
+
+# How hard writes try to reach the disk before returning:
+#   "always"  - fsync every write before returning (safest, slowest)
+#   "batched" - a rewritten file's data is fsynced before it replaces the old version, so
+#               no file is ever left empty; the renames and journal appends are fsynced
+#               together once FSYNC_BATCH_SECONDS pass - a power loss can lose at most
+#               that window's writes
+#   "never"   - leave it to the OS; a crash of the app alone never truncates a file,
+#               but a power loss can leave a renamed file empty or lose recent writes
+FSYNC_POLICIES = ("always", "batched", "never")
+DEFAULT_FSYNC_POLICY = "batched"
+FSYNC_BATCH_SECONDS = 5.0
+
+# On-disk layout for data files - all three are read back transparently
+#   "indent"  - pretty-printed JSON (easy to read and diff by hand)
+#   "compact" - JSON without whitespace (smaller, faster to write and parse)
+#   "gzip"    - compact JSON, gzip-compressed (smallest on disk)
+STORAGE_FORMATS = ("indent", "compact", "gzip")
+DEFAULT_STORAGE_FORMAT = "indent"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Files (and directories) written since the batched window opened
+_pending_fsync = set()
+_pending_lock = threading.Lock()
+_fsync_timer = None
+
+
+def load_app_settings():
+    """Read app_settings.json - returns an empty dict if it is missing or broken"""
+    if not os.path.exists(APP_SETTINGS_FILE):
+        return {}
+    try:
+        with open(APP_SETTINGS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except:
+        return {}
+
+
+def get_fsync_policy():
+    """Durability policy chosen in app_settings.json ("fsync_policy")"""
+    policy = load_app_settings().get("fsync_policy", DEFAULT_FSYNC_POLICY)
+    return policy if policy in FSYNC_POLICIES else DEFAULT_FSYNC_POLICY
+
+
+def get_storage_format():
+    """On-disk format chosen in app_settings.json ("storage_format")"""
+    storage_format = load_app_settings().get("storage_format", DEFAULT_STORAGE_FORMAT)
+    return storage_format if storage_format in STORAGE_FORMATS else DEFAULT_STORAGE_FORMAT
+
+
+def _fsync_path(path, directory=False):
+    # Directories make renames durable (they can't be opened for fsync on Windows)
+    try:
+        fd = os.open(path, os.O_RDONLY if directory else os.O_RDWR)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _queue_fsync(path, directory=False):
+    """Remember a file (or a directory whose entries changed) to fsync when the batched window closes"""
+    global _fsync_timer
+    path = os.path.abspath(path)
+    with _pending_lock:
+        if not directory:
+            _pending_fsync.add((path, False))
+        _pending_fsync.add((path if directory else os.path.dirname(path), True))
+        if _fsync_timer is None:
+            _fsync_timer = threading.Timer(FSYNC_BATCH_SECONDS, flush_pending_fsyncs)
+            _fsync_timer.daemon = True
+            _fsync_timer.start()
+
+
+def flush_pending_fsyncs():
+    """fsync everything queued since the batched window opened (also called when the app closes)"""
+    global _fsync_timer
+    with _pending_lock:
+        if _fsync_timer is not None:
+            _fsync_timer.cancel()
+            _fsync_timer = None
+        pending = sorted(_pending_fsync, key=lambda entry: entry[1])
+        _pending_fsync.clear()
+    # Files first, then the directories holding their renames
+    for path, directory in pending:
+        _fsync_path(path, directory)
+
+
+def _make_backup(path):
+    """Point <path>.bak at the current version without ever taking path away"""
+    backup_path = path + ".bak"
+    tmp_backup = f"{backup_path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_backup):
+        os.remove(tmp_backup)
+    try:
+        # A hard link costs no copy and keeps the file's identity (inode, mtime)
+        os.link(path, tmp_backup)
+    except OSError:
+        # Filesystems without hard links
+        shutil.copy2(path, tmp_backup)
+    os.replace(tmp_backup, backup_path)
+
+
+def atomic_write_bytes(path, payload, backup=False, policy=None):
+    """Write a file via temp file + rename so a crash never leaves it truncated
+
+    With backup=True the previous version is kept as <path>.bak. Either way
+    path always holds a complete version - it is never missing mid-write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    policy = policy or get_fsync_policy()
+    sync = policy == "always"
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            if policy != "never":
+                # The data must be on disk before the rename can point at it
+                os.fsync(f.fileno())
+
+        if backup and os.path.exists(path):
+            # Rolling backup: the version being replaced becomes the .bak
+            _make_backup(path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    if sync:
+        _fsync_path(directory, directory=True)
+    elif policy == "batched":
+        # Only the renames are left to sync
+        _queue_fsync(directory, directory=True)
+
+
+def atomic_write_text(path, text, backup=False, policy=None):
+    """Write a text file atomically - see atomic_write_bytes"""
+    atomic_write_bytes(path, text.encode('utf-8'), backup=backup, policy=policy)
+
+
+def encode_json(data, storage_format="indent", ensure_ascii=True) -> bytes:
+    """Serialize data in one of the STORAGE_FORMATS"""
+    if storage_format == "indent":
+        return json.dumps(data, indent=4, ensure_ascii=ensure_ascii).encode('utf-8')
+
+    payload = json.dumps(data, ensure_ascii=ensure_ascii, separators=(',', ':')).encode('utf-8')
+    if storage_format == "gzip":
+        # Level 6 is most of level 9's size win at a fraction of the time
+        return gzip.compress(payload, compresslevel=6)
+    return payload
+
+
+def decode_json(payload: bytes):
+    """Parse bytes written by encode_json - the format is detected, not configured"""
+    if payload.startswith(GZIP_MAGIC):
+        payload = gzip.decompress(payload)
+    return json.loads(payload)
+
+
+def atomic_write_json(path, data, storage_format="indent", ensure_ascii=True, backup=False, policy=None):
+    """json.dump() to path atomically - see atomic_write_bytes"""
+    atomic_write_bytes(path, encode_json(data, storage_format, ensure_ascii),
+                       backup=backup, policy=policy)
+
+
+def append_text(path, text, policy=None):
+    """Append to a file, fsyncing according to the durability policy"""
+    policy = policy or get_fsync_policy()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        if policy == "always":
+            os.fsync(f.fileno())
+    if policy == "batched":
+        _queue_fsync(path)
+
+
+def read_json_with_backup(path, default=None):
+    """Load JSON (in any storage format) from path, falling back to <path>.bak if it is damaged
+
+    Returns default if neither exists. Raises ValueError if the file exists
+    but neither it nor its backup can be read, so callers don't mistake a
+    corrupted file for an empty one and overwrite it.
+    """
+    if not os.path.exists(path) and not os.path.exists(path + ".bak"):
+        return default
+
+    for candidate in (path, path + ".bak"):
+        if not os.path.exists(candidate):
+            continue
+        try:
+            with open(candidate, 'rb') as f:
+                data = decode_json(f.read())
+        except (OSError, ValueError, EOFError, zlib.error):
+            continue
+
+        if candidate != path and os.path.exists(path):
+            # Keep the damaged file around for inspection before it gets replaced
+            shutil.copyfile(path, path + ".corrupt")
+            print(f"⚠️ {path} is damaged - recovered from backup")
+        return data
+
+    raise ValueError(f"{path} is damaged and has no readable backup")